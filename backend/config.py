@@ -1,36 +1,71 @@
 import os
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
 
 load_dotenv()
 
 # Database
 DATABASE_URL = os.environ.get("DATABASE_URL")
+# Connection pool sizing, overridable per deploy. The async pool serves request-path
+# writes; the sync pool serves auth, admin batch jobs and migrations. Keep the two
+# totals (size + overflow) under the server's max_connections (100 by default)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "40"))
+DB_SYNC_POOL_SIZE = int(os.environ.get("DB_SYNC_POOL_SIZE", "5"))
+DB_SYNC_MAX_OVERFLOW = int(os.environ.get("DB_SYNC_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "3600"))
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
+# Create tables on boot; otherwise run scripts/migrate.py once per deploy
+RUN_MIGRATIONS = os.environ.get("RUN_MIGRATIONS") == "1"
 
 # Mock mode (for testing without API key)
 MOCK_MODE = os.environ.get("MOCK_MODE", "false").lower() == "true"
 
 # OpenAI
 OPENAI_MODEL = "gpt-5.2"
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", "120"))
+# 429s and 5xx are retried by the SDK with jittered exponential backoff
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "5"))
+# Client-side throttle, kept under the account's rate limits
+OPENAI_MAX_CONCURRENT = int(os.environ.get("OPENAI_MAX_CONCURRENT", "10"))
+OPENAI_RPM = int(os.environ.get("OPENAI_RPM", "500"))
+OPENAI_TPM = int(os.environ.get("OPENAI_TPM", "500000"))
+# Identical requests within the TTL reuse the earlier response (0 disables)
+LLM_CACHE_SIZE = int(os.environ.get("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", "86400"))
+
+# PDF pages are rendered for OCR as JPEG (much smaller for scans) unless set to "png"
+OCR_IMAGE_FORMAT = "png" if os.environ.get("OCR_IMAGE_FORMAT", "jpeg").lower() == "png" else "jpeg"
+OCR_DPI = int(os.environ.get("OCR_DPI", "150"))
+
+# Browser origins allowed to call the API (comma-separated)
+CORS_ORIGINS = tuple(
+    origin.strip() for origin in os.environ.get(
+        "CORS_ORIGINS",
+        "https://cantheyfuckme.com,https://www.cantheyfuckme.com,http://localhost:5173"
+    ).split(",") if origin.strip()
+)
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
 
 # Stripe
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY")
 STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET")
 STRIPE_PRICE_UNLOCK = os.environ.get("STRIPE_PRICE_UNLOCK", "price_unlock_3usd")
 
+@lru_cache(maxsize=1)
 def get_api_key():
     key = os.environ.get("OPENAI_API_KEY")
     if key:
         return key
     env_path = Path(__file__).parent / ".env"
     if env_path.exists():
-        with open(env_path) as f:
-            for line in f:
-                if line.startswith("OPENAI_API_KEY="):
-                    key = line.split("=", 1)[1].strip()
-                    if key:
-                        return key
-    home_config = Path.home() / ".openai" / "api_key"
-    if home_config.exists():
-        return home_config.read_text().strip()
-    return None
+        key = dotenv_values(env_path).get("OPENAI_API_KEY")
+        if key:
+            return key
+    try:
+        return (Path.home() / ".openai" / "api_key").read_text().strip()
+    except FileNotFoundError:
+        return None
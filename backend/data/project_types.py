@@ -1,3 +1,14 @@
+# Coverage/endorsement requirements shared by every full-compliance project type
+_FULL_COMPLIANCE = {
+    "workers_comp_required": True,
+    "auto_liability_required": True,
+    "additional_insured_required": True,
+    "waiver_of_subrogation_required": True,
+    "primary_noncontributory_required": True,
+    "cg_20_10_required": True,
+    "cg_20_37_required": True,
+}
+
 # Preset project types with their requirements
 PROJECT_TYPE_REQUIREMENTS = {
     "commercial_construction": {
@@ -6,13 +17,7 @@ PROJECT_TYPE_REQUIREMENTS = {
         "gl_aggregate": 2000000,
         "umbrella_required": True,
         "umbrella_minimum": 2000000,
-        "workers_comp_required": True,
-        "auto_liability_required": True,
-        "additional_insured_required": True,
-        "waiver_of_subrogation_required": True,
-        "primary_noncontributory_required": True,
-        "cg_20_10_required": True,
-        "cg_20_37_required": True,
+        **_FULL_COMPLIANCE,
     },
     "residential_construction": {
         "name": "Residential Construction",
@@ -34,13 +39,7 @@ PROJECT_TYPE_REQUIREMENTS = {
         "gl_aggregate": 4000000,
         "umbrella_required": True,
         "umbrella_minimum": 5000000,
-        "workers_comp_required": True,
-        "auto_liability_required": True,
-        "additional_insured_required": True,
-        "waiver_of_subrogation_required": True,
-        "primary_noncontributory_required": True,
-        "cg_20_10_required": True,
-        "cg_20_37_required": True,
+        **_FULL_COMPLIANCE,
     },
     "industrial_manufacturing": {
         "name": "Industrial/Manufacturing",
@@ -48,12 +47,6 @@ PROJECT_TYPE_REQUIREMENTS = {
         "gl_aggregate": 4000000,
         "umbrella_required": True,
         "umbrella_minimum": 5000000,
-        "workers_comp_required": True,
-        "auto_liability_required": True,
-        "additional_insured_required": True,
-        "waiver_of_subrogation_required": True,
-        "primary_noncontributory_required": True,
-        "cg_20_10_required": True,
-        "cg_20_37_required": True,
+        **_FULL_COMPLIANCE,
     },
 }
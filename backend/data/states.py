@@ -1,6 +1,8 @@
 # State-specific insurance requirements data
 # Based on comprehensive research as of January 2026
 
+from types import MappingProxyType
+
 STATE_WORKERS_COMP = {
     # Format: "STATE": {"required": bool, "threshold": int or None, "construction_specific": str, "monopolistic": bool}
     "AL": {"required": True, "threshold": 5, "construction_specific": "5+ employees", "monopolistic": False},
@@ -113,6 +115,34 @@ STATE_ANTI_INDEMNITY = {
     "DC": {"type": "Partial", "voids_ai_for_sole_negligence": False, "insurance_savings_clause": True, "notes": "Construction-specific; insurance savings clause"},
 }
 
+# State-specific mitigation strategies for broad anti-indemnity states
+STATE_MITIGATIONS = MappingProxyType({
+    "AZ": "Consider CG 24 26 endorsement or higher primary limits on your own CGL.",
+    "CO": "Wrap-up/OCIP recommended for larger projects. Ensure contractual liability coverage on your policy.",
+    "GA": "Primary & non-contributory language remains valid. Verify your own CGL limits are adequate.",
+    "KS": "Wrap-up programs or higher umbrella limits on your own policy recommended.",
+    "MT": "OCIP/CCIP wrap-up insurance or project-specific coverage. Your own policy should be primary.",
+    "OR": "CG 24 26 amendment endorsement or contractual liability on your CGL.",
+})
+
+# Concrete mitigation options per broad anti-indemnity state, listed by /api/ai-limited-states
+STATE_MITIGATION_OPTIONS = MappingProxyType({
+    "AZ": ("CG 24 26 endorsement (excludes your negligence from AI)", "Higher primary limits on your own CGL"),
+    "CO": ("Wrap-up/OCIP for larger projects", "Contractual liability coverage on your policy", "Explicit fault allocation in subcontracts"),
+    "GA": ("Primary & non-contributory language still valid", "Ensure your own CGL has adequate limits"),
+    "KS": ("Wrap-up programs", "Higher umbrella limits on your policy"),
+    "MT": ("OCIP/CCIP wrap-up insurance", "Project-specific coverage", "Your own policy must be primary"),
+    "OR": ("CG 24 26 amendment endorsement", "Contractual liability on your CGL"),
+})
+
+# Anti-indemnity warning text for the states above, interpolated once at import
+STATE_AI_EXPLANATIONS = MappingProxyType({
+    code: f"{code}'s broad anti-indemnity statute limits AI coverage when you share fault. "
+          f"{STATE_MITIGATIONS.get(code, 'Review coverage with your broker.')}"
+    for code, rules in STATE_ANTI_INDEMNITY.items()
+    if rules.get('voids_ai_for_sole_negligence')
+})
+
 # State GL requirements for contractor licensing
 STATE_GL_REQUIREMENTS = {
     # Format: "STATE": {"required_for_license": bool, "minimum_per_occurrence": int or None, "notes": str}
@@ -225,6 +255,17 @@ STATE_AUTO_MINIMUMS = {
     "DC": {"bodily_injury_per_person": 25000, "bodily_injury_per_accident": 50000, "property_damage": 10000, "combined_single_limit": None},
 }
 
+# Contractor tables merged per state so a check does one lookup instead of four
+STATE_RULES = {
+    code: {
+        "wc": STATE_WORKERS_COMP.get(code, {}),
+        "ai": STATE_ANTI_INDEMNITY.get(code, {}),
+        "gl": STATE_GL_REQUIREMENTS.get(code, {}),
+        "auto": STATE_AUTO_MINIMUMS.get(code, {}),
+    }
+    for code in STATE_WORKERS_COMP
+}
+
 # State gym protections
 STATE_GYM_PROTECTIONS = {
     "CA": {
@@ -1,24 +1,57 @@
 from datetime import datetime
+from contextlib import asynccontextmanager
+import orjson
 from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON, Boolean, ForeignKey
-from sqlalchemy.orm import declarative_base, sessionmaker, relationship
-from config import DATABASE_URL
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, relationship
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from starlette.concurrency import run_in_threadpool
+from config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_SYNC_POOL_SIZE, DB_SYNC_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_CONNECT_TIMEOUT, RUN_MIGRATIONS
 
 Base = declarative_base()
 db_engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
 
 
-def init_db():
-    global db_engine, SessionLocal
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+
+def init_db(create_tables: bool = RUN_MIGRATIONS):
+    global db_engine, SessionLocal, async_engine, AsyncSessionLocal
     if DATABASE_URL:
         db_url = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-        db_engine = create_engine(db_url)
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-        try:
-            Base.metadata.create_all(bind=db_engine)
-            print("Database initialized successfully")
-        except Exception as e:
-            print(f"Database table creation failed (will retry on first request): {e}")
+        is_postgres = db_url.startswith("postgresql://")
+        # Pre-ping drops stale connections; recycle avoids idle TCP drops on the host
+        pool_args = dict(
+            pool_recycle=DB_POOL_RECYCLE, pool_pre_ping=True,
+            json_serializer=_json_serializer, json_deserializer=orjson.loads
+        )
+        if is_postgres:
+            # Each engine has its own pool, so the sync one is sized separately
+            db_engine = create_engine(
+                db_url, **pool_args, pool_size=DB_SYNC_POOL_SIZE, max_overflow=DB_SYNC_MAX_OVERFLOW,
+                connect_args={"connect_timeout": DB_CONNECT_TIMEOUT}
+            )
+        else:
+            db_engine = create_engine(db_url)
+        # Thread-local sessions, reused across calls instead of re-created per call
+        SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=db_engine))
+        # asyncpg engine for request-path writes so they don't block the event loop
+        if is_postgres:
+            async_engine = create_async_engine(
+                db_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+                **pool_args, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+                connect_args={"timeout": DB_CONNECT_TIMEOUT}
+            )
+            AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+        if create_tables:
+            try:
+                Base.metadata.create_all(bind=db_engine)
+                print("Database initialized successfully")
+            except Exception as e:
+                print(f"Database table creation failed (will retry on first request): {e}")
         return True
     else:
         print("DATABASE_URL not set - running without database storage")
@@ -34,3 +67,56 @@ def get_db():
     except:
         db.close()
         raise
+
+
+async def close_db():
+    """Dispose the async engine's pooled connections"""
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+@asynccontextmanager
+async def session_scope():
+    """Async transactional scope: commit on success, roll back on error.
+
+    Yields None when no async database is configured.
+    """
+    if AsyncSessionLocal is None:
+        yield None
+        return
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except:
+            await db.rollback()
+            raise
+
+
+def _run_in_sync_session(fn):
+    """Run fn(session) in a transaction on this worker thread's sync session"""
+    db = SessionLocal()
+    try:
+        result = fn(db)
+        db.commit()
+        return result
+    except:
+        db.rollback()
+        raise
+    finally:
+        SessionLocal.remove()
+
+
+async def run_in_session(fn):
+    """Run fn(session) in a transaction without blocking the event loop.
+
+    Uses the async engine when there is one (Postgres); databases without an async
+    driver (e.g. SQLite) use the sync session in a worker thread. Returns None when
+    no database is configured.
+    """
+    if AsyncSessionLocal is not None:
+        async with session_scope() as db:
+            return await db.run_sync(fn)
+    if SessionLocal is not None:
+        return await run_in_threadpool(_run_in_sync_session, fn)
+    return None
@@ -1,19 +1,26 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import init_db
-from routers import auth, payments, documents, analyzers, reference, waitlist
+from fastapi.responses import ORJSONResponse
+from config import CORS_ORIGINS
+from database import init_db, close_db
+from routers import auth, payments, documents, analyzers, reference, waitlist, admin
+from services.llm import warm_up_client, close_client
 
 # Initialize database on startup
 init_db()
 
-app = FastAPI(title="Insurance LLM", description="Pixel-powered insurance document intelligence")
+app = FastAPI(
+    title="Insurance LLM",
+    description="Pixel-powered insurance document intelligence",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST", "OPTIONS"),
+    allow_headers=("Authorization", "Content-Type", "X-Admin-Token"),
 )
 
 # Include all routers
@@ -23,6 +30,18 @@ app.include_router(documents.router)
 app.include_router(analyzers.router)
 app.include_router(reference.router)
 app.include_router(waitlist.router)
+app.include_router(admin.router)
+
+
+@app.on_event("startup")
+async def startup():
+    await warm_up_client()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_client()
+    await close_db()
 
 
 @app.get("/")
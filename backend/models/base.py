@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from database import Base
 
 
@@ -12,7 +13,8 @@ class Upload(Base):
     document_text = Column(Text)
     text_length = Column(Integer)
     state = Column(String(10), nullable=True)
-    analysis_result = Column(JSON, nullable=True)
+    # JSONB on Postgres (binary, indexable); plain JSON elsewhere
+    analysis_result = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     overall_risk = Column(String(20), nullable=True)
     risk_score = Column(Integer, nullable=True)
     red_flag_count = Column(Integer, nullable=True)
@@ -20,6 +22,9 @@ class Upload(Base):
     user_agent = Column(String(500), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
 
+    # Listing uploads by type, newest first
+    __table_args__ = (Index("ix_uploads_doctype_created", "document_type", "created_at"),)
+
 
 class Waitlist(Base):
     __tablename__ = "waitlist"
@@ -107,3 +107,53 @@ Check these items (mark as warnings if issues found):
 12. Certificate holder name/address correct
 
 Return ONLY valid JSON, no markdown formatting."""
+
+# Extraction and compliance in a single call, for COIs not yet extracted. The field and
+# check specs are sliced from the two prompts above so the three stay in sync.
+_EXTRACTION_SPEC = COI_EXTRACTION_PROMPT[
+    COI_EXTRACTION_PROMPT.index("Return a JSON object with these fields:"):COI_EXTRACTION_PROMPT.index("COI Document:")
+].strip()
+_COMPLIANCE_SPEC = COI_COMPLIANCE_PROMPT[
+    COI_COMPLIANCE_PROMPT.index("Analyze EACH requirement"):COI_COMPLIANCE_PROMPT.rindex("Return ONLY valid JSON")
+].strip()
+
+COI_EXTRACT_AND_CHECK_PROMPT = """You are an expert insurance document analyst and compliance analyst specializing in Certificates of Insurance (ACORD 25 forms). In one pass, extract the COI data and check it against the contract requirements.
+
+STEP 1 - EXTRACTION. Build the "coi_data" object:
+""" + _EXTRACTION_SPEC + """
+
+STEP 2 - COMPLIANCE. Using your Step 1 data, build the "compliance" object.
+
+CRITICAL DISTINCTION: Being listed as "Certificate Holder" does NOT make someone an Additional Insured. The Additional Insured box must be checked AND proper endorsements (CG 20 10, CG 20 37) should be referenced. This distinction has cost companies millions in lawsuits.
+
+""" + _COMPLIANCE_SPEC + """
+
+Contract Requirements:
+<<REQUIREMENTS>>
+
+Project Type: <<PROJECT_TYPE>>
+
+COI Document:
+<<DOCUMENT>>
+
+Return ONLY valid JSON of the form {"coi_data": {...Step 1...}, "compliance": {...Step 2...}}, no markdown formatting."""
+
+# Templates pre-split at their placeholders so building a prompt is one join
+# rather than a full scan of the template per placeholder
+_COMPLIANCE_PRE, _rest = COI_COMPLIANCE_PROMPT.split("<<COI_DATA>>")
+_COMPLIANCE_MID, _rest = _rest.split("<<REQUIREMENTS>>")
+_COMPLIANCE_TYPE, _COMPLIANCE_POST = _rest.split("<<PROJECT_TYPE>>")
+_FUSED_PRE, _rest = COI_EXTRACT_AND_CHECK_PROMPT.split("<<REQUIREMENTS>>")
+_FUSED_TYPE, _rest = _rest.split("<<PROJECT_TYPE>>")
+_FUSED_DOC, _FUSED_POST = _rest.split("<<DOCUMENT>>")
+del _rest
+
+
+def build_compliance_prompt(coi_data: str, requirements: str, project_type: str) -> str:
+    """COI_COMPLIANCE_PROMPT with the extracted data, requirements and project type filled in"""
+    return "".join((_COMPLIANCE_PRE, coi_data, _COMPLIANCE_MID, requirements, _COMPLIANCE_TYPE, project_type, _COMPLIANCE_POST))
+
+
+def build_extract_and_check_prompt(document: str, requirements: str, project_type: str) -> str:
+    """COI_EXTRACT_AND_CHECK_PROMPT with the document, requirements and project type filled in"""
+    return "".join((_FUSED_PRE, requirements, _FUSED_TYPE, project_type, _FUSED_DOC, document, _FUSED_POST))
@@ -48,3 +48,19 @@ Include at least 1-2 "boilerplate" items per analysis to reassure the user that
 
 Be direct and practical.
 Return ONLY valid JSON."""
+
+# Pre-split at the placeholders so building the prompt is one join
+_EMPLOYMENT_PRE, _rest = EMPLOYMENT_ANALYSIS_PROMPT.split("<<CONTRACT>>")
+_EMPLOYMENT_STATE, _rest = _rest.split("<<STATE>>")
+_EMPLOYMENT_SALARY, _rest = _rest.split("<<SALARY>>")
+_EMPLOYMENT_RULES, _rest = _rest.split("<<STATE_RULES>>")
+_EMPLOYMENT_FLAGS, _EMPLOYMENT_POST = _rest.split("<<RED_FLAGS>>")
+del _rest
+
+
+def build_employment_prompt(contract: str, state: str, salary: str, state_rules: str, red_flags: str) -> str:
+    """EMPLOYMENT_ANALYSIS_PROMPT with the contract, state, salary, state rules and red flags filled in"""
+    return "".join((
+        _EMPLOYMENT_PRE, contract, _EMPLOYMENT_STATE, state, _EMPLOYMENT_SALARY, salary,
+        _EMPLOYMENT_RULES, state_rules, _EMPLOYMENT_FLAGS, red_flags, _EMPLOYMENT_POST,
+    ))
@@ -46,3 +46,15 @@ Include at least 1-2 "boilerplate" items per analysis to reassure the user that
 
 Be direct. Use phrases like "This means..." and "You're agreeing to..."
 Return ONLY valid JSON."""
+
+# Pre-split at the placeholders so building the prompt is one join
+_GYM_PRE, _rest = GYM_ANALYSIS_PROMPT.split("<<CONTRACT>>")
+_GYM_STATE, _rest = _rest.split("<<STATE>>")
+_GYM_LAWS, _rest = _rest.split("<<STATE_LAWS>>")
+_GYM_FLAGS, _GYM_POST = _rest.split("<<RED_FLAGS>>")
+del _rest
+
+
+def build_gym_prompt(contract: str, state: str, state_laws: str, red_flags: str) -> str:
+    """GYM_ANALYSIS_PROMPT with the contract, state, state laws and red flags filled in"""
+    return "".join((_GYM_PRE, contract, _GYM_STATE, state, _GYM_LAWS, state_laws, _GYM_FLAGS, red_flags, _GYM_POST))
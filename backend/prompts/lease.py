@@ -103,3 +103,14 @@ Be direct and practical. Use phrases like "This could cost you..." and "You're a
 The tenant needs to understand the REAL risks, not legal jargon.
 
 Return ONLY valid JSON, no markdown."""
+
+# Pre-split at the placeholders so building the prompt is one join
+_ANALYSIS_PRE, _rest = LEASE_ANALYSIS_PROMPT.split("<<LEASE_DATA>>")
+_ANALYSIS_FLAGS, _rest = _rest.split("<<RED_FLAGS>>")
+_ANALYSIS_STATE, _ANALYSIS_POST = _rest.split("<<STATE>>")
+del _rest
+
+
+def build_lease_analysis_prompt(lease_data: str, red_flags: str, state: str) -> str:
+    """LEASE_ANALYSIS_PROMPT with the extracted lease data, red flags and state filled in"""
+    return "".join((_ANALYSIS_PRE, lease_data, _ANALYSIS_FLAGS, red_flags, _ANALYSIS_STATE, state, _ANALYSIS_POST))
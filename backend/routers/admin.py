@@ -0,0 +1,51 @@
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from config import ADMIN_TOKEN, MOCK_MODE
+from schemas.common import ReprocessInput
+from services.batch import (build_batch_requests, submit_batch, apply_batch_output,
+                            BATCH_DONE_STATUSES)
+from services.llm import get_client
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def require_admin(request: Request):
+    """Reject the request unless it carries the configured admin token"""
+    token = request.headers.get("X-Admin-Token", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/reprocess")
+async def reprocess_uploads(input: ReprocessInput, request: Request):
+    """Re-run stored uploads through the OpenAI Batch API (cheaper, separate rate limits)"""
+    require_admin(request)
+    if MOCK_MODE:
+        raise HTTPException(status_code=400, detail="Batch reprocessing is not available in mock mode")
+
+    jsonl, upload_ids = await build_batch_requests(input.upload_ids)
+    if not upload_ids:
+        raise HTTPException(status_code=400, detail="No reprocessable uploads found")
+
+    try:
+        batch = await submit_batch(jsonl)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch submission failed: {str(e)}")
+
+    return {"batch_id": batch.id, "status": batch.status, "upload_ids": upload_ids}
+
+
+@router.post("/reprocess/{batch_id}/apply")
+async def apply_reprocess(batch_id: str, request: Request):
+    """Check a reprocessing batch and, once it has completed, save its results"""
+    require_admin(request)
+    try:
+        batch = await get_client().batches.retrieve(batch_id)
+        if batch.status not in BATCH_DONE_STATUSES:
+            return {"batch_id": batch_id, "status": batch.status, "updated": 0}
+        updated = await apply_batch_output(batch)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Applying batch failed: {str(e)}")
+
+    return {"batch_id": batch_id, "status": batch.status, "updated": updated}
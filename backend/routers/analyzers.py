@@ -1,10 +1,15 @@
 import json
+import asyncio
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import TypeAdapter
 from config import MOCK_MODE, OPENAI_MODEL
-from services.llm import get_client, clean_llm_response, parse_limit_to_number, calculate_extraction_confidence
+from services.llm import create_chat_completion, clean_llm_response, parse_json_reply, parse_limit_to_number, calculate_extraction_confidence
 from services.auth import get_current_user, hash_document, check_premium_access, use_credit
-from services.db_ops import save_upload
+from services.db_ops import save_upload, save_uploads_bulk, upload_row
+from services.cache import LRUCache
 from services.mock.coi import mock_coi_extract, mock_compliance_check
 from services.mock.lease import mock_lease_analysis
 from services.mock.gym import mock_gym_analysis
@@ -20,7 +25,7 @@ from services.mock.subscription import mock_subscription_analysis
 from services.mock.debt_settlement import mock_debt_settlement_analysis
 
 from schemas.common import (
-    COIComplianceInput, ComplianceReport,
+    COIComplianceInput, BatchCOIComplianceInput, BatchCOIResult, ComplianceReport,
 )
 from schemas.lease import LeaseAnalysisInput, LeaseAnalysisReport, LeaseInsuranceClause, LeaseRedFlag
 from schemas.gym import GymContractInput, GymContractReport
@@ -35,10 +40,10 @@ from schemas.nursing_home import NursingHomeInput, NursingHomeReport
 from schemas.subscription import SubscriptionInput, SubscriptionReport
 from schemas.debt_settlement import DebtSettlementInput, DebtSettlementReport
 
-from prompts.coi import COI_EXTRACTION_PROMPT, COI_COMPLIANCE_PROMPT
-from prompts.lease import LEASE_EXTRACTION_PROMPT, LEASE_ANALYSIS_PROMPT
-from prompts.gym import GYM_ANALYSIS_PROMPT
-from prompts.employment import EMPLOYMENT_ANALYSIS_PROMPT
+from prompts.coi import build_compliance_prompt, build_extract_and_check_prompt
+from prompts.lease import LEASE_EXTRACTION_PROMPT, build_lease_analysis_prompt
+from prompts.gym import build_gym_prompt
+from prompts.employment import build_employment_prompt
 from prompts.freelancer import FREELANCER_ANALYSIS_PROMPT
 from prompts.influencer import INFLUENCER_ANALYSIS_PROMPT
 from prompts.timeshare import TIMESHARE_ANALYSIS_PROMPT
@@ -61,96 +66,164 @@ from data.red_flags import LEASE_RED_FLAGS, GYM_RED_FLAGS, EMPLOYMENT_RED_FLAGS
 
 router = APIRouter(prefix="/api", tags=["analyzers"])
 
+# The red flag tables are static, so their prompt JSON is encoded once at import
+_LEASE_RED_FLAGS_JSON = orjson.dumps(LEASE_RED_FLAGS, option=orjson.OPT_INDENT_2).decode()
+_GYM_RED_FLAGS_JSON = orjson.dumps(GYM_RED_FLAGS, option=orjson.OPT_INDENT_2).decode()
+_EMPLOYMENT_RED_FLAGS_JSON = orjson.dumps(EMPLOYMENT_RED_FLAGS, option=orjson.OPT_INDENT_2).decode()
 
-# ============== COI COMPLIANCE CHECK ==============
+# Extracted COI data by document hash; extraction doesn't depend on the requirements
+_coi_extraction_cache = LRUCache(maxsize=512)
+# Compliance results by (document hash, requirements JSON)
+_coi_compliance_cache = LRUCache(maxsize=512)
 
-@router.post("/check-coi-compliance", response_model=ComplianceReport)
-async def check_coi_compliance(input: COIComplianceInput, request: Request):
-    """Check a Certificate of Insurance against contract requirements"""
-    try:
-        # Compute document hash and check premium access
-        doc_hash = hash_document(input.coi_text)
-        user = get_current_user(request)
-        is_premium = False
-        if user:
-            is_premium = check_premium_access(user.id, doc_hash)
+# Serializer for batch results, built once
+_BATCH_RESULTS = TypeAdapter(list[BatchCOIResult])
 
-        # Get requirements from preset or custom
-        if input.project_type and input.project_type in PROJECT_TYPE_REQUIREMENTS:
-            requirements = PROJECT_TYPE_REQUIREMENTS[input.project_type]
-        elif input.custom_requirements:
-            requirements = input.custom_requirements
-        else:
-            # Default to commercial construction requirements
-            requirements = PROJECT_TYPE_REQUIREMENTS["commercial_construction"]
 
-        project_type_name = requirements.get('name', 'Commercial Construction')
+# ============== COI COMPLIANCE CHECK ==============
 
-        # Use mock mode or real API
-        if MOCK_MODE:
-            coi_data = mock_coi_extract(input.coi_text)
-            result = mock_compliance_check(coi_data, requirements, input.state)
-            # Save upload
-            save_upload("coi", input.coi_text, input.state, result, user_id=user.id if user else None)
+def _resolve_coi_requirements(project_type: str, custom_requirements: dict) -> dict:
+    """Get requirements from preset or custom"""
+    if project_type and project_type in PROJECT_TYPE_REQUIREMENTS:
+        return PROJECT_TYPE_REQUIREMENTS[project_type]
+    if custom_requirements:
+        return custom_requirements
+    # Default to commercial construction requirements
+    return PROJECT_TYPE_REQUIREMENTS["commercial_construction"]
+
+
+def _complete_compliance(result: dict, coi_data: dict) -> ComplianceReport:
+    """Attach the COI data and extraction confidence to a compliance result and validate it"""
+    result['coi_data'] = coi_data
+    result['extraction_metadata'] = calculate_extraction_confidence(coi_data)
+    return ComplianceReport(**result)
+
+
+def _parse_fused_reply(content: str) -> tuple[dict, dict, ComplianceReport]:
+    """Split a fused extract-and-check reply into (coi_data, result, report); raises if either part is unusable"""
+    fused = parse_json_reply(content)
+    coi_data = fused["coi_data"]
+    result = fused["compliance"]
+    return coi_data, result, _complete_compliance(result, coi_data)
+
+
+async def _check_one_coi(coi_text: str, requirements: dict, state: str, user, pending_uploads: list = None) -> ComplianceReport:
+    """Run extraction + compliance for a single COI and save the upload.
+
+    If pending_uploads is given, the upload row is appended to it for a bulk save instead.
+    """
+    # Compute document hash and check premium access
+    doc_hash = hash_document(coi_text)
+    is_premium = False
+    if user:
+        is_premium = check_premium_access(user.id, doc_hash)
+
+    # Use mock mode or real API
+    if MOCK_MODE:
+        coi_data = mock_coi_extract(coi_text)
+        result = mock_compliance_check(coi_data, requirements, state)
+        report = ComplianceReport(**result)
+    else:
+        # The same COI against the same requirements reuses the whole result
+        requirements_json = orjson.dumps(requirements, option=orjson.OPT_INDENT_2).decode()
+        compliance_key = (doc_hash, requirements_json)
+        result = _coi_compliance_cache.get(compliance_key)
+        if result is not None:
             report = ComplianceReport(**result)
-            report.document_hash = doc_hash
-            report.is_premium = is_premium
-            report.total_issues = len(result.get("critical_gaps", [])) + len(result.get("warnings", []))
-            return report
-
-        # Step 1: Extract COI data
-        extract_prompt = COI_EXTRACTION_PROMPT.replace("<<DOCUMENT>>", input.coi_text)
-        response = get_client().chat.completions.create(
-            model=OPENAI_MODEL,
-            max_completion_tokens=4096,
-            messages=[{"role": "user", "content": extract_prompt}]
-        )
-
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
-
-        coi_data = json.loads(response_text)
+        else:
+            project_type_name = requirements.get('name', 'Commercial Construction')
+            coi_data = _coi_extraction_cache.get(doc_hash)
+            if coi_data is None:
+                # New COI: extract and check compliance in a single call
+                fused_prompt = build_extract_and_check_prompt(coi_text, requirements_json, project_type_name)
+                response = await create_chat_completion(
+                    validate=_parse_fused_reply,
+                    model=OPENAI_MODEL,
+                    max_completion_tokens=8192,
+                    messages=[{"role": "user", "content": fused_prompt}]
+                )
+
+                coi_data, result, report = _parse_fused_reply(response.choices[0].message.content)
+            else:
+                # Already-extracted COI (e.g. other requirements): only check compliance
+                compliance_prompt = build_compliance_prompt(
+                    orjson.dumps(coi_data, option=orjson.OPT_INDENT_2).decode(),
+                    requirements_json,
+                    project_type_name
+                )
+
+                response = await create_chat_completion(
+                    validate=lambda content: _complete_compliance(parse_json_reply(content), coi_data),
+                    model=OPENAI_MODEL,
+                    max_completion_tokens=4096,
+                    messages=[{"role": "user", "content": compliance_prompt}]
+                )
+
+                result = parse_json_reply(response.choices[0].message.content)
+                report = _complete_compliance(result, coi_data)
+
+            # Cache only once the report has validated, so a malformed reply is retried rather than replayed
+            _coi_extraction_cache.set(doc_hash, coi_data)
+            _coi_compliance_cache.set(compliance_key, result)
+
+    # Save upload
+    user_id = user.id if user else None
+    if pending_uploads is None:
+        await save_upload("coi", coi_text, state, result, user_id=user_id)
+    else:
+        pending_uploads.append(upload_row("coi", coi_text, state, result, user_id=user_id))
+
+    report.document_hash = doc_hash
+    report.is_premium = is_premium
+    report.total_issues = len(result.get("critical_gaps", [])) + len(result.get("warnings", []))
+    return report
 
-        # Step 2: Check compliance
-        compliance_prompt = COI_COMPLIANCE_PROMPT.replace("<<COI_DATA>>", json.dumps(coi_data, indent=2))
-        compliance_prompt = compliance_prompt.replace("<<REQUIREMENTS>>", json.dumps(requirements, indent=2))
-        compliance_prompt = compliance_prompt.replace("<<PROJECT_TYPE>>", project_type_name)
 
-        response = get_client().chat.completions.create(
-            model=OPENAI_MODEL,
-            max_completion_tokens=4096,
-            messages=[{"role": "user", "content": compliance_prompt}]
-        )
-
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
+@router.post("/check-coi-compliance", response_model=ComplianceReport)
+async def check_coi_compliance(input: COIComplianceInput, request: Request):
+    """Check a Certificate of Insurance against contract requirements"""
+    try:
+        user = get_current_user(request)
+        requirements = _resolve_coi_requirements(input.project_type, input.custom_requirements)
+        report = await _check_one_coi(input.coi_text, requirements, input.state, user)
+        # The report was just validated; serialize it directly instead of letting
+        # FastAPI re-validate it against response_model
+        return Response(content=report.model_dump_json(), media_type="application/json")
 
-        result = json.loads(response_text)
-        result['coi_data'] = coi_data
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse response: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Calculate extraction confidence metadata
-        extraction_metadata = calculate_extraction_confidence(coi_data)
-        result['extraction_metadata'] = extraction_metadata
 
-        # Save upload
-        save_upload("coi", input.coi_text, input.state, result, user_id=user.id if user else None)
+@router.post("/check-coi-compliance/batch", response_model=list[BatchCOIResult])
+async def check_coi_compliance_batch(input: BatchCOIComplianceInput, request: Request):
+    """Check many Certificates of Insurance against the same contract requirements.
 
-        report = ComplianceReport(**result)
-        report.document_hash = doc_hash
-        report.is_premium = is_premium
-        report.total_issues = len(result.get("critical_gaps", [])) + len(result.get("warnings", []))
-        return report
+    Results are in input order; a COI that fails gets an error entry instead of
+    failing the whole batch, and the ones that succeeded are still saved.
+    """
+    try:
+        # User and requirements are shared by the whole batch, so resolve them once
+        user = get_current_user(request)
+        requirements = _resolve_coi_requirements(input.project_type, input.custom_requirements)
+        pending_uploads = []
+        outcomes = await asyncio.gather(*(
+            _check_one_coi(coi_text, requirements, input.state, user, pending_uploads)
+            for coi_text in input.coi_texts
+        ), return_exceptions=True)
+        await save_uploads_bulk(pending_uploads)
+
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, json.JSONDecodeError):
+                results.append(BatchCOIResult(error=f"Failed to parse response: {outcome}"))
+            elif isinstance(outcome, BaseException):
+                results.append(BatchCOIResult(error=str(outcome)))
+            else:
+                results.append(BatchCOIResult(report=outcome))
+        return Response(content=_BATCH_RESULTS.dump_json(results), media_type="application/json")
 
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse response: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -171,52 +244,44 @@ async def analyze_lease(input: LeaseAnalysisInput, request: Request):
         # Mock mode
         if MOCK_MODE:
             result = mock_lease_analysis(input.lease_text, input.state)
-            save_upload("lease", input.lease_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("lease", input.lease_text, input.state, result, user_id=user.id if user else None)
             report = LeaseAnalysisReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("missing_protections", []))
             return report
 
-        client = get_client()
-
         # Step 1: Extract lease data
         extract_prompt = LEASE_EXTRACTION_PROMPT.replace("<<DOCUMENT>>", input.lease_text[:15000])  # Limit length
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": extract_prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        lease_data = json.loads(response_text)
+        lease_data = orjson.loads(response_text)
 
         # Step 2: Analyze for red flags
-        analysis_prompt = LEASE_ANALYSIS_PROMPT.replace("<<LEASE_DATA>>", json.dumps(lease_data, indent=2))
-        analysis_prompt = analysis_prompt.replace("<<RED_FLAGS>>", json.dumps(LEASE_RED_FLAGS, indent=2))
-        analysis_prompt = analysis_prompt.replace("<<STATE>>", input.state or "Not specified")
+        analysis_prompt = build_lease_analysis_prompt(
+            orjson.dumps(lease_data, option=orjson.OPT_INDENT_2).decode(),
+            _LEASE_RED_FLAGS_JSON,
+            input.state or "Not specified",
+        )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": analysis_prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        analysis = json.loads(response_text)
+        analysis = orjson.loads(response_text)
 
         # Merge extraction and analysis
         result = {
@@ -224,7 +289,7 @@ async def analyze_lease(input: LeaseAnalysisInput, request: Request):
             "risk_score": analysis.get("risk_score", 50),
             "red_flags": analysis.get("red_flags", [])
         }
-        save_upload("lease", input.lease_text, input.state, result, user_id=user.id if user else None)
+        await save_upload("lease", input.lease_text, input.state, result, user_id=user.id if user else None)
 
         # Calculate total issues for teaser
         red_flags = analysis.get("red_flags", [])
@@ -270,37 +335,34 @@ async def analyze_gym_contract(input: GymContractInput, request: Request):
 
         if MOCK_MODE:
             result = mock_gym_analysis(input.contract_text, input.state)
-            save_upload("gym", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("gym", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = GymContractReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", []))
             return report
 
-        client = get_client()
-
         # Get state laws
         state_laws = STATE_GYM_PROTECTIONS.get(input.state.upper() if input.state else "", {})
 
-        prompt = GYM_ANALYSIS_PROMPT.replace("<<CONTRACT>>", input.contract_text[:15000])
-        prompt = prompt.replace("<<STATE>>", input.state or "Not specified")
-        prompt = prompt.replace("<<STATE_LAWS>>", json.dumps(state_laws, indent=2))
-        prompt = prompt.replace("<<RED_FLAGS>>", json.dumps(GYM_RED_FLAGS, indent=2))
+        prompt = build_gym_prompt(
+            input.contract_text[:15000],
+            input.state or "Not specified",
+            orjson.dumps(state_laws, option=orjson.OPT_INDENT_2).decode(),
+            _GYM_RED_FLAGS_JSON,
+        )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("gym", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("gym", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = GymContractReport(**result)
         report.document_hash = doc_hash
@@ -327,37 +389,34 @@ async def analyze_employment_contract(input: EmploymentContractInput, request: R
 
         if MOCK_MODE:
             result = mock_employment_analysis(input.contract_text, input.state, input.salary)
-            save_upload("employment", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("employment", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = EmploymentContractReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", []))
             return report
 
-        client = get_client()
-
         state_rules = NON_COMPETE_STATES.get(input.state.upper() if input.state else "", {})
 
-        prompt = EMPLOYMENT_ANALYSIS_PROMPT.replace("<<CONTRACT>>", input.contract_text[:15000])
-        prompt = prompt.replace("<<STATE>>", input.state or "Not specified")
-        prompt = prompt.replace("<<SALARY>>", f"${input.salary:,}" if input.salary else "Not specified")
-        prompt = prompt.replace("<<STATE_RULES>>", json.dumps(state_rules, indent=2))
-        prompt = prompt.replace("<<RED_FLAGS>>", json.dumps(EMPLOYMENT_RED_FLAGS, indent=2))
+        prompt = build_employment_prompt(
+            input.contract_text[:15000],
+            input.state or "Not specified",
+            f"${input.salary:,}" if input.salary else "Not specified",
+            orjson.dumps(state_rules, option=orjson.OPT_INDENT_2).decode(),
+            _EMPLOYMENT_RED_FLAGS_JSON,
+        )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("employment", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("employment", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = EmploymentContractReport(**result)
         report.document_hash = doc_hash
@@ -384,34 +443,29 @@ async def analyze_freelancer_contract(input: FreelancerContractInput, request: R
 
         if MOCK_MODE:
             result = mock_freelancer_analysis(input.contract_text, input.project_value)
-            save_upload("freelancer", input.contract_text, None, result, user_id=user.id if user else None)
+            await save_upload("freelancer", input.contract_text, None, result, user_id=user.id if user else None)
             report = FreelancerContractReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("missing_protections", []))
             return report
 
-        client = get_client()
-
         prompt = FREELANCER_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             project_value=f"${input.project_value:,}" if input.project_value else "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("freelancer", input.contract_text, None, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("freelancer", input.contract_text, None, result, user_id=user.id if user else None)
 
         report = FreelancerContractReport(**result)
         report.document_hash = doc_hash
@@ -438,34 +492,29 @@ async def analyze_influencer_contract(input: InfluencerContractInput, request: R
 
         if MOCK_MODE:
             result = mock_influencer_analysis(input.contract_text, input.base_rate)
-            save_upload("influencer", input.contract_text, None, result, user_id=user.id if user else None)
+            await save_upload("influencer", input.contract_text, None, result, user_id=user.id if user else None)
             report = InfluencerContractReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", []))
             return report
 
-        client = get_client()
-
         prompt = INFLUENCER_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             base_rate=f"${input.base_rate:,}" if input.base_rate else "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("influencer", input.contract_text, None, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("influencer", input.contract_text, None, result, user_id=user.id if user else None)
 
         report = InfluencerContractReport(**result)
         report.document_hash = doc_hash
@@ -497,15 +546,13 @@ async def analyze_timeshare_contract(input: TimeshareContractInput, request: Req
                 input.purchase_price,
                 input.annual_fee
             )
-            save_upload("timeshare", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("timeshare", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = TimeshareContractReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", []))
             return report
 
-        client = get_client()
-
         rescission_info = TIMESHARE_RESCISSION.get(input.state.upper() if input.state else "", {})
 
         prompt = TIMESHARE_ANALYSIS_PROMPT.format(
@@ -516,20 +563,17 @@ async def analyze_timeshare_contract(input: TimeshareContractInput, request: Req
             annual_fee=f"${input.annual_fee:,}" if input.annual_fee else "Unknown"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("timeshare", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("timeshare", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = TimeshareContractReport(**result)
         report.document_hash = doc_hash
@@ -556,35 +600,30 @@ async def analyze_insurance_policy(input: InsurancePolicyInput, request: Request
 
         if MOCK_MODE:
             result = mock_insurance_policy_analysis(input.policy_text, input.policy_type, input.state)
-            save_upload("insurance_policy", input.policy_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("insurance_policy", input.policy_text, input.state, result, user_id=user.id if user else None)
             report = InsurancePolicyReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("coverage_gaps", []))
             return report
 
-        client = get_client()
-
         prompt = INSURANCE_POLICY_ANALYSIS_PROMPT.format(
             policy_text=input.policy_text[:15000],
             policy_type=input.policy_type or "Determine from text",
             state=input.state or "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("insurance_policy", input.policy_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("insurance_policy", input.policy_text, input.state, result, user_id=user.id if user else None)
 
         report = InsurancePolicyReport(**result)
         report.document_hash = doc_hash
@@ -610,15 +649,13 @@ async def analyze_auto_purchase(input: AutoPurchaseInput, request: Request):
 
         if MOCK_MODE:
             result = mock_auto_purchase_analysis(input.contract_text, input.state, input.vehicle_price, input.trade_in_value)
-            save_upload("auto_purchase", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("auto_purchase", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = AutoPurchaseReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", []))
             return report
 
-        client = get_client()
-
         prompt = AUTO_PURCHASE_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             state=input.state or "Not specified",
@@ -626,20 +663,17 @@ async def analyze_auto_purchase(input: AutoPurchaseInput, request: Request):
             trade_in_value=f"${input.trade_in_value:,}" if input.trade_in_value else "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("auto_purchase", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("auto_purchase", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = AutoPurchaseReport(**result)
         report.document_hash = doc_hash
@@ -665,35 +699,30 @@ async def analyze_home_improvement(input: HomeImprovementInput, request: Request
 
         if MOCK_MODE:
             result = mock_home_improvement_analysis(input.contract_text, input.state, input.project_cost)
-            save_upload("home_improvement", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("home_improvement", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = HomeImprovementReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("missing_protections", []))
             return report
 
-        client = get_client()
-
         prompt = HOME_IMPROVEMENT_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             state=input.state or "Not specified",
             project_cost=f"${input.project_cost:,}" if input.project_cost else "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("home_improvement", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("home_improvement", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = HomeImprovementReport(**result)
         report.document_hash = doc_hash
@@ -719,34 +748,29 @@ async def analyze_nursing_home(input: NursingHomeInput, request: Request):
 
         if MOCK_MODE:
             result = mock_nursing_home_analysis(input.contract_text, input.state)
-            save_upload("nursing_home", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("nursing_home", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = NursingHomeReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("illegal_clauses", []))
             return report
 
-        client = get_client()
-
         prompt = NURSING_HOME_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             state=input.state or "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("nursing_home", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("nursing_home", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = NursingHomeReport(**result)
         report.document_hash = doc_hash
@@ -772,34 +796,29 @@ async def analyze_subscription(input: SubscriptionInput, request: Request):
 
         if MOCK_MODE:
             result = mock_subscription_analysis(input.contract_text, input.monthly_cost)
-            save_upload("subscription", input.contract_text, None, result, user_id=user.id if user else None)
+            await save_upload("subscription", input.contract_text, None, result, user_id=user.id if user else None)
             report = SubscriptionReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("dark_patterns", []))
             return report
 
-        client = get_client()
-
         prompt = SUBSCRIPTION_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             monthly_cost=f"${input.monthly_cost:,.2f}" if input.monthly_cost else "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("subscription", input.contract_text, None, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("subscription", input.contract_text, None, result, user_id=user.id if user else None)
 
         report = SubscriptionReport(**result)
         report.document_hash = doc_hash
@@ -825,35 +844,30 @@ async def analyze_debt_settlement(input: DebtSettlementInput, request: Request):
 
         if MOCK_MODE:
             result = mock_debt_settlement_analysis(input.contract_text, input.state, input.debt_amount)
-            save_upload("debt_settlement", input.contract_text, input.state, result, user_id=user.id if user else None)
+            await save_upload("debt_settlement", input.contract_text, input.state, result, user_id=user.id if user else None)
             report = DebtSettlementReport(**result)
             report.document_hash = doc_hash
             report.is_premium = is_premium
             report.total_issues = len(result.get("red_flags", [])) + len(result.get("missing_protections", []))
             return report
 
-        client = get_client()
-
         prompt = DEBT_SETTLEMENT_ANALYSIS_PROMPT.format(
             contract_text=input.contract_text[:15000],
             state=input.state or "Not specified",
             debt_amount=f"${input.debt_amount:,}" if input.debt_amount else "Not specified"
         )
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        result = json.loads(response_text.strip())
-        save_upload("debt_settlement", input.contract_text, input.state, result, user_id=user.id if user else None)
+        result = orjson.loads(response_text)
+        await save_upload("debt_settlement", input.contract_text, input.state, result, user_id=user.id if user else None)
 
         report = DebtSettlementReport(**result)
         report.document_hash = doc_hash
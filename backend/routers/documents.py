@@ -1,10 +1,17 @@
-import json
 import base64
-
-from fastapi import APIRouter, HTTPException
-from config import MOCK_MODE, OPENAI_MODEL
-from services.llm import get_client, clean_llm_response
+import asyncio
+import hashlib
+
+import orjson
+from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from config import MOCK_MODE, OPENAI_MODEL, OCR_IMAGE_FORMAT, OCR_DPI
+from services.llm import create_chat_completion, parse_chat_completion, stream_chat_completion, clean_llm_response, parse_json_reply
+from services.auth import hash_document
+from services.cache import LRUCache
 from services.mock.extract import mock_extract
+from services.mock.classify import mock_classify
 from schemas.common import DocumentInput, ExtractedPolicy, OCRInput, ClassifyInput, ClassifyResult
 from data.supported_doc_types import SUPPORTED_DOC_TYPES
 from prompts.extraction import EXTRACTION_PROMPT
@@ -12,6 +19,11 @@ from prompts.classify import CLASSIFY_PROMPT, OCR_PROMPT
 
 router = APIRouter(prefix="/api", tags=["documents"])
 
+# OCR text by SHA-256 of the uploaded bytes: a re-upload skips rendering and the Vision calls
+_ocr_cache = LRUCache(maxsize=128)
+# Classification by hash of the classified sample
+_classify_cache = LRUCache(maxsize=1024)
+
 
 @router.post("/extract", response_model=ExtractedPolicy)
 async def extract_document(doc: DocumentInput):
@@ -23,7 +35,10 @@ async def extract_document(doc: DocumentInput):
             return ExtractedPolicy(**extracted)
 
         prompt = EXTRACTION_PROMPT.replace("<<DOCUMENT>>", doc.text)
-        response = get_client().chat.completions.create(
+        # Structured output: the SDK sends ExtractedPolicy as a strict JSON schema and
+        # validates the reply into the model, so there is no fence to strip
+        response = await parse_chat_completion(
+            ExtractedPolicy,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[
@@ -31,21 +46,15 @@ async def extract_document(doc: DocumentInput):
                     "role": "user",
                     "content": prompt
                 }
-            ]
+            ],
         )
 
-        response_text = response.choices[0].message.content
-        # Clean up potential markdown formatting
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
-
-        extracted = json.loads(response_text)
-        return ExtractedPolicy(**extracted)
+        message = response.choices[0].message
+        if message.parsed is None:
+            raise ValueError(f"Model refused extraction: {message.refusal}")
+        return message.parsed
 
-    except json.JSONDecodeError as e:
+    except ValidationError as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse LLM response: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -57,17 +66,15 @@ async def compare_quotes(quotes: list[DocumentInput]):
     if len(quotes) < 2:
         raise HTTPException(status_code=400, detail="Need at least 2 quotes to compare")
 
-    # Extract each quote
-    extracted_quotes = []
-    for quote in quotes:
-        extracted = await extract_document(quote)
-        extracted_quotes.append(extracted)
+    # Extract all quotes concurrently; create_chat_completion bounds the fan-out
+    extracted_quotes = await asyncio.gather(*(extract_document(quote) for quote in quotes))
 
-    # Generate comparison
+    # Generate comparison - embed quotes as compact JSON, not Python repr
+    quotes_json = orjson.dumps([q.model_dump() for q in extracted_quotes]).decode()
     comparison_prompt = f"""Compare these {len(extracted_quotes)} insurance quotes and provide a recommendation.
 
 Quotes:
-{[q.model_dump() for q in extracted_quotes]}
+{quotes_json}
 
 Provide a JSON response with:
 - recommendation: Which quote is best and why (string)
@@ -79,34 +86,27 @@ Provide a JSON response with:
 Return ONLY valid JSON."""
 
     try:
-        response = get_client().chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model=OPENAI_MODEL,
             max_completion_tokens=4096,
             messages=[{"role": "user", "content": comparison_prompt}]
         )
 
-        response_text = response.choices[0].message.content
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+        response_text = clean_llm_response(response.choices[0].message.content)
 
-        return json.loads(response_text.strip())
+        return orjson.loads(response_text)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/generate-proposal")
-async def generate_proposal(extracted: ExtractedPolicy):
-    """Generate a polished client-ready proposal from extracted data"""
-
-    # Mock proposal generation
-    if MOCK_MODE:
-        coverages_text = "\n".join([f"- **{c.type}**: {c.limit}" for c in extracted.coverages]) if extracted.coverages else "- No coverages specified"
-        exclusions_text = "\n".join([f"- {e}" for e in extracted.exclusions]) if extracted.exclusions else "- None noted"
+def _render_proposal_template(extracted: ExtractedPolicy) -> str:
+    """Deterministic markdown proposal, used in mock mode and when the extraction is complete"""
+    coverages_text = "\n".join([f"- **{c.type}**: {c.limit}" for c in extracted.coverages]) if extracted.coverages else "- No coverages specified"
+    exclusions_text = "\n".join([f"- {e}" for e in extracted.exclusions]) if extracted.exclusions else "- None noted"
 
-        proposal = f"""# Insurance Coverage Summary
+    proposal = f"""# Insurance Coverage Summary
 
 ## Policy Overview
 - **Insured**: {extracted.insured_name or 'Not specified'}
@@ -131,11 +131,22 @@ Coverage adequacy score: **{extracted.risk_score or 'N/A'}/100**
 ---
 *Generated by Insurance.exe - Pixel Perfect Coverage Analysis*
 """
-        return {"proposal": proposal}
+    return proposal
 
-    proposal_prompt = f"""Create a professional insurance proposal summary for a client based on this extracted policy data:
 
-{extracted.model_dump()}
+def _proposal_fields_complete(extracted: ExtractedPolicy) -> bool:
+    """True when every field the template shows is filled in, so an LLM rewrite adds little"""
+    return bool(
+        extracted.insured_name and extracted.policy_number and extracted.carrier
+        and extracted.total_premium and extracted.coverages
+    )
+
+
+def _proposal_prompt(extracted: ExtractedPolicy) -> str:
+    """Prompt asking the model for a client-ready markdown proposal"""
+    return f"""Create a professional insurance proposal summary for a client based on this extracted policy data:
+
+{extracted.model_dump_json()}
 
 Write a clear, client-friendly proposal that:
 1. Summarizes key coverages in plain English
@@ -145,159 +156,182 @@ Write a clear, client-friendly proposal that:
 
 Format as markdown with clear sections. Keep it concise but comprehensive."""
 
+
+@router.post("/generate-proposal")
+async def generate_proposal(extracted: ExtractedPolicy):
+    """Generate a polished client-ready proposal from extracted data"""
+
+    # Mock mode, or a complete extraction: the template needs no LLM call
+    if MOCK_MODE or _proposal_fields_complete(extracted):
+        return {"proposal": _render_proposal_template(extracted), "source": "template"}
+
     try:
-        response = get_client().chat.completions.create(
+        response = await create_chat_completion(
             model=OPENAI_MODEL,
             max_completion_tokens=2048,
-            messages=[{"role": "user", "content": proposal_prompt}]
+            messages=[{"role": "user", "content": _proposal_prompt(extracted)}]
         )
 
-        return {"proposal": response.choices[0].message.content}
+        return {"proposal": response.choices[0].message.content, "source": "llm"}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/ocr")
-async def ocr_document(input: OCRInput):
-    """Extract text from PDF or image using OpenAI Vision API"""
+@router.post("/generate-proposal/stream")
+async def generate_proposal_stream(extracted: ExtractedPolicy):
+    """Stream the proposal markdown as it is generated so the client can render it immediately"""
+
+    if MOCK_MODE or _proposal_fields_complete(extracted):
+        return StreamingResponse(iter((_render_proposal_template(extracted),)), media_type="text/markdown")
+
+    stream = stream_chat_completion(
+        model=OPENAI_MODEL,
+        max_completion_tokens=2048,
+        messages=[{"role": "user", "content": _proposal_prompt(extracted)}],
+    )
+    try:
+        # Start the stream before responding so a failed request is still an HTTP error
+        first = await anext(stream, None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def chunks():
+        if first is None:
+            return
+        if first.choices and first.choices[0].delta.content:
+            yield first.choices[0].delta.content
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    return StreamingResponse(chunks(), media_type="text/markdown")
+
+
+def _render_pdf_pages(file_bytes: bytes) -> tuple[int, list[str]]:
+    """Render the first pages of a PDF to image data URLs; returns (total page count, urls)"""
+    import fitz  # PyMuPDF
+
+    # Open PDF from bytes
+    pdf_doc = fitz.open(stream=file_bytes, filetype="pdf")
+    try:
+        data_urls = []
+        data_url_prefix = f"data:image/{OCR_IMAGE_FORMAT};base64,"
+        # Process each page (limit to first 5 pages for performance)
+        for page_num in range(min(len(pdf_doc), 5)):
+            page = pdf_doc[page_num]
+            # Render page to image (150 DPI by default) for good quality
+            pix = page.get_pixmap(dpi=OCR_DPI)
+            if OCR_IMAGE_FORMAT == "png":
+                img_bytes = pix.tobytes("png")
+            else:
+                img_bytes = pix.tobytes("jpeg", jpg_quality=85)
+            # Release the raw raster (~6MB at 150 DPI) before encoding and the next render
+            pix = None
+
+            # Create data URL for image; base64 output is ASCII, so decode without a UTF-8 scan
+            data_urls.append(data_url_prefix + base64.b64encode(img_bytes).decode('ascii'))
+            img_bytes = None
+        return len(pdf_doc), data_urls
+    finally:
+        pdf_doc.close()
+
+
+async def _ocr_image(data_url: str) -> str:
+    """Extract the text from one image with the Vision API"""
+    response = await create_chat_completion(
+        model="gpt-5.2",
+        max_completion_tokens=4096,
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": OCR_PROMPT
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": data_url
+                        }
+                    }
+                ]
+            }
+        ]
+    )
+    return response.choices[0].message.content
+
+
+async def _ocr_file(file_bytes: bytes, file_type: str, file_name: str) -> dict:
+    """Extract text from PDF or image bytes using OpenAI Vision API"""
     try:
         # Mock mode - return placeholder text
         if MOCK_MODE:
             return {
-                "text": f"[Mock OCR result for {input.file_name}]\n\nSample extracted text would appear here.\nUpload a real document with OPENAI_API_KEY configured."
+                "text": f"[Mock OCR result for {file_name}]\n\nSample extracted text would appear here.\nUpload a real document with OPENAI_API_KEY configured."
             }
 
-        client = get_client()
-
-        # Decode base64 file data
-        file_bytes = base64.b64decode(input.file_data)
+        cache_key = (hashlib.sha256(file_bytes).hexdigest(), file_type)
+        cached = _ocr_cache.get(cache_key)
+        if cached is not None:
+            return {"text": cached}
 
         # Handle PDFs by converting to images first
-        if input.file_type == 'application/pdf':
-            import fitz  # PyMuPDF
-            import io
-
-            # Open PDF from bytes
-            pdf_doc = fitz.open(stream=file_bytes, filetype="pdf")
-
-            all_text = []
-            # Process each page (limit to first 5 pages for performance)
-            for page_num in range(min(len(pdf_doc), 5)):
-                page = pdf_doc[page_num]
-                # Render page to image at 150 DPI for good quality
-                pix = page.get_pixmap(dpi=150)
-                img_bytes = pix.tobytes("png")
-                img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-
-                # Create data URL for image
-                data_url = f"data:image/png;base64,{img_base64}"
-
-                # Call Vision API for this page
-                response = client.chat.completions.create(
-                    model="gpt-5.2",
-                    max_completion_tokens=4096,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": OCR_PROMPT
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": data_url
-                                    }
-                                }
-                            ]
-                        }
-                    ]
-                )
+        if file_type == 'application/pdf':
+            # Rendering is CPU-bound, so keep it off the event loop
+            page_count, data_urls = await asyncio.to_thread(_render_pdf_pages, file_bytes)
 
-                page_text = response.choices[0].message.content
-                if len(pdf_doc) > 1:
-                    all_text.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                else:
-                    all_text.append(page_text)
+            # OCR all pages concurrently; create_chat_completion bounds the fan-out
+            page_texts = await asyncio.gather(*(_ocr_image(data_url) for data_url in data_urls))
 
-            pdf_doc.close()
-            return {"text": "\n\n".join(all_text)}
+            if page_count > 1:
+                all_text = [f"--- Page {page_num + 1} ---\n{page_text}" for page_num, page_text in enumerate(page_texts)]
+            else:
+                all_text = page_texts
+            text = "\n\n".join(all_text)
 
         # Handle images directly
-        elif input.file_type.startswith('image/'):
-            media_type = input.file_type
-            data_url = f"data:{media_type};base64,{input.file_data}"
-
-            response = client.chat.completions.create(
-                model="gpt-5.2",
-                max_completion_tokens=4096,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": OCR_PROMPT
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": data_url
-                                }
-                            }
-                        ]
-                    }
-                ]
-            )
+        elif file_type.startswith('image/'):
+            media_type = file_type
+            data_url = f"data:{media_type};base64,{base64.b64encode(file_bytes).decode('utf-8')}"
 
-            return {"text": response.choices[0].message.content}
+            text = await _ocr_image(data_url)
 
         else:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {input.file_type}")
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type}")
+
+        _ocr_cache.set(cache_key, text)
+        return {"text": text}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OCR failed: {str(e)}")
 
 
+@router.post("/ocr")
+async def ocr_document(file: UploadFile = File(...)):
+    """Extract text from an uploaded PDF or image (multipart, no base64)"""
+    file_bytes = await file.read()
+    return await _ocr_file(file_bytes, file.content_type or "", file.filename or "upload")
+
+
+@router.post("/ocr/base64")
+async def ocr_document_base64(input: OCRInput):
+    """Legacy OCR endpoint taking the file as base64 in a JSON body"""
+    try:
+        file_bytes = base64.b64decode(input.file_data)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"OCR failed: {str(e)}")
+    return await _ocr_file(file_bytes, input.file_type, input.file_name)
+
+
 @router.post("/classify", response_model=ClassifyResult)
 async def classify_document(input: ClassifyInput):
     """Classify document type using cheap/fast model"""
     try:
         # Mock mode
         if MOCK_MODE:
-            text_lower = input.text.lower()
-            if 'certificate' in text_lower and ('insurance' in text_lower or 'liability' in text_lower):
-                doc_type = "coi"
-            elif 'lease' in text_lower or ('landlord' in text_lower and 'tenant' in text_lower):
-                doc_type = "lease"
-            elif 'gym' in text_lower or 'fitness' in text_lower or ('membership' in text_lower and ('cancel' in text_lower or 'dues' in text_lower)):
-                doc_type = "gym_contract"
-            elif 'timeshare' in text_lower or 'vacation ownership' in text_lower or ('resort' in text_lower and 'maintenance fee' in text_lower):
-                doc_type = "timeshare_contract"
-            elif 'influencer' in text_lower or 'brand deal' in text_lower or ('content' in text_lower and 'usage rights' in text_lower) or 'sponsorship' in text_lower:
-                doc_type = "influencer_contract"
-            elif 'independent contractor' in text_lower or 'freelance' in text_lower or ('contractor' in text_lower and 'deliverables' in text_lower):
-                doc_type = "freelancer_contract"
-            elif 'employment' in text_lower or 'non-compete' in text_lower or ('employee' in text_lower and ('arbitration' in text_lower or 'at-will' in text_lower)):
-                doc_type = "employment_contract"
-            elif 'policy' in text_lower and 'premium' in text_lower:
-                doc_type = "insurance_policy"
-            elif ('vehicle' in text_lower or 'dealer' in text_lower or 'vin' in text_lower) and ('purchase' in text_lower or 'financing' in text_lower or 'buyer' in text_lower):
-                doc_type = "auto_purchase"
-            elif ('contractor' in text_lower or 'renovation' in text_lower or 'remodel' in text_lower) and ('scope' in text_lower or 'completion' in text_lower or 'lien' in text_lower or 'home improvement' in text_lower):
-                doc_type = "home_improvement"
-            elif 'nursing' in text_lower or 'assisted living' in text_lower or ('admission' in text_lower and ('facility' in text_lower or 'resident' in text_lower)):
-                doc_type = "nursing_home"
-            elif 'subscription' in text_lower or 'auto-renew' in text_lower or ('recurring' in text_lower and 'billing' in text_lower) or 'saas' in text_lower:
-                doc_type = "subscription"
-            elif ('debt' in text_lower or 'settlement' in text_lower) and ('creditor' in text_lower or 'collection' in text_lower or 'paid in full' in text_lower or 'balance' in text_lower):
-                doc_type = "debt_settlement"
-            elif 'agreement' in text_lower or 'contract' in text_lower:
-                doc_type = "contract"
-            else:
-                doc_type = "unknown"
+            doc_type = mock_classify(input.text)
 
             doc_info = SUPPORTED_DOC_TYPES[doc_type]
             return ClassifyResult(
@@ -307,12 +341,15 @@ async def classify_document(input: ClassifyInput):
                 supported=doc_info["supported"]
             )
 
-        client = get_client()
-
         # Use cheap model for classification - just need first ~2000 chars
         sample_text = input.text[:2000]
+        sample_hash = hash_document(sample_text)
+        cached = _classify_cache.get(sample_hash)
+        if cached is not None:
+            return cached
 
-        response = client.chat.completions.create(
+        response = await create_chat_completion(
+            validate=parse_json_reply,
             model="gpt-4o-mini",  # Cheap and fast
             max_completion_tokens=150,
             messages=[
@@ -321,16 +358,10 @@ async def classify_document(input: ClassifyInput):
             ]
         )
 
-        response_text = response.choices[0].message.content.strip()
-
         # Parse JSON response
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
+        response_text = clean_llm_response(response.choices[0].message.content.strip())
 
-        result = json.loads(response_text)
+        result = orjson.loads(response_text)
         doc_type = result.get("type", "unknown")
 
         # Validate doc_type
@@ -339,14 +370,16 @@ async def classify_document(input: ClassifyInput):
 
         doc_info = SUPPORTED_DOC_TYPES[doc_type]
 
-        return ClassifyResult(
+        classified = ClassifyResult(
             document_type=doc_type,
             confidence=result.get("confidence", 0.5),
             description=doc_info["name"],
             supported=doc_info["supported"]
         )
+        _classify_cache.set(sample_hash, classified)
+        return classified
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return ClassifyResult(
             document_type="unknown",
             confidence=0.0,
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from data.states import STATE_WORKERS_COMP, STATE_ANTI_INDEMNITY, STATE_GL_REQUIREMENTS, STATE_AUTO_MINIMUMS
+from functools import lru_cache
+
+import orjson
+from fastapi import APIRouter, HTTPException, Response
+from data.states import STATE_ANTI_INDEMNITY, STATE_RULES, STATE_MITIGATION_OPTIONS
 from data.project_types import PROJECT_TYPE_REQUIREMENTS
 
 router = APIRouter(prefix="/api", tags=["reference"])
 
 
-@router.get("/project-types")
-async def get_project_types():
-    """Get available preset project types and their requirements"""
+def _build_project_types() -> dict:
     return {
         key: {
             "name": val["name"],
@@ -20,14 +21,13 @@ async def get_project_types():
     }
 
 
-@router.get("/states")
-async def get_states():
-    """Get list of all states with summary of their insurance rules"""
+def _build_states() -> list:
     states = []
-    for state_code in sorted(STATE_WORKERS_COMP.keys()):
-        wc = STATE_WORKERS_COMP.get(state_code, {})
-        ai = STATE_ANTI_INDEMNITY.get(state_code, {})
-        gl = STATE_GL_REQUIREMENTS.get(state_code, {})
+    for state_code in sorted(STATE_RULES.keys()):
+        rules = STATE_RULES[state_code]
+        wc = rules["wc"]
+        ai = rules["ai"]
+        gl = rules["gl"]
 
         states.append({
             "code": state_code,
@@ -42,20 +42,33 @@ async def get_states():
     return states
 
 
-@router.get("/state/{state_code}")
-async def get_state_details(state_code: str):
-    """Get detailed insurance requirements for a specific state"""
-    state_upper = state_code.upper()
+# The reference tables are static, so these responses are encoded once at import
+_PROJECT_TYPES_JSON = orjson.dumps(_build_project_types())
+_STATES_JSON = orjson.dumps(_build_states())
 
-    if state_upper not in STATE_WORKERS_COMP:
-        raise HTTPException(status_code=404, detail=f"State {state_upper} not found")
 
-    wc = STATE_WORKERS_COMP.get(state_upper, {})
-    ai = STATE_ANTI_INDEMNITY.get(state_upper, {})
-    gl = STATE_GL_REQUIREMENTS.get(state_upper, {})
-    auto = STATE_AUTO_MINIMUMS.get(state_upper, {})
+@router.get("/project-types")
+async def get_project_types():
+    """Get available preset project types and their requirements"""
+    return Response(content=_PROJECT_TYPES_JSON, media_type="application/json")
 
-    return {
+
+@router.get("/states")
+async def get_states():
+    """Get list of all states with summary of their insurance rules"""
+    return Response(content=_STATES_JSON, media_type="application/json")
+
+
+@lru_cache(maxsize=64)
+def _state_details_json(state_upper: str) -> bytes:
+    """Build and encode the details for one state; a pure function of the state code"""
+    rules = STATE_RULES[state_upper]
+    wc = rules["wc"]
+    ai = rules["ai"]
+    gl = rules["gl"]
+    auto = rules["auto"]
+
+    return orjson.dumps({
         "state": state_upper,
         "workers_comp": {
             "required": wc.get('required', True),
@@ -82,32 +95,42 @@ async def get_state_details(state_code: str):
             "property_damage": f"${auto.get('property_damage', 25000):,}",
             "combined_format": f"{auto.get('bodily_injury_per_person', 25000)//1000}/{auto.get('bodily_injury_per_accident', 50000)//1000}/{auto.get('property_damage', 25000)//1000}"
         }
-    }
+    })
 
 
-@router.get("/ai-limited-states")
-async def get_ai_limited_states():
-    """Get states with broad anti-indemnity statutes that limit AI coverage"""
-    mitigations = {
-        "AZ": ["CG 24 26 endorsement (excludes your negligence from AI)", "Higher primary limits on your own CGL"],
-        "CO": ["Wrap-up/OCIP for larger projects", "Contractual liability coverage on your policy", "Explicit fault allocation in subcontracts"],
-        "GA": ["Primary & non-contributory language still valid", "Ensure your own CGL has adequate limits"],
-        "KS": ["Wrap-up programs", "Higher umbrella limits on your policy"],
-        "MT": ["OCIP/CCIP wrap-up insurance", "Project-specific coverage", "Your own policy must be primary"],
-        "OR": ["CG 24 26 amendment endorsement", "Contractual liability on your CGL"],
-    }
+@router.get("/state/{state_code}")
+async def get_state_details(state_code: str):
+    """Get detailed insurance requirements for a specific state"""
+    state_upper = state_code.upper()
 
-    states = []
-    for state_code, ai_rules in STATE_ANTI_INDEMNITY.items():
-        if ai_rules.get('voids_ai_for_sole_negligence'):
-            states.append({
-                "state": state_code,
-                "statute_type": ai_rules.get('type'),
-                "mitigation_options": mitigations.get(state_code, []),
-                "insurance_savings_clause": ai_rules.get('insurance_savings_clause', False)
-            })
+    if state_upper not in STATE_RULES:
+        raise HTTPException(status_code=404, detail=f"State {state_upper} not found")
+
+    return Response(content=_state_details_json(state_upper), media_type="application/json")
+
+
+def _build_ai_limited_states() -> dict:
+    states = [
+        {
+            "state": state_code,
+            "statute_type": ai_rules.get('type'),
+            "mitigation_options": STATE_MITIGATION_OPTIONS.get(state_code, ()),
+            "insurance_savings_clause": ai_rules.get('insurance_savings_clause', False)
+        }
+        for state_code, ai_rules in STATE_ANTI_INDEMNITY.items()
+        if ai_rules.get('voids_ai_for_sole_negligence')
+    ]
     return {
         "states": states,
         "count": len(states),
         "note": "These states have broad anti-indemnity statutes. AI coverage may be limited when you share fault. See mitigation options for each state."
     }
+
+
+_AI_LIMITED_STATES_JSON = orjson.dumps(_build_ai_limited_states())
+
+
+@router.get("/ai-limited-states")
+async def get_ai_limited_states():
+    """Get states with broad anti-indemnity statutes that limit AI coverage"""
+    return Response(content=_AI_LIMITED_STATES_JSON, media_type="application/json")
@@ -13,7 +13,7 @@ async def add_to_waitlist(input: WaitlistInput):
         raise HTTPException(status_code=400, detail="Invalid email address")
 
     # Save to database
-    entry_id = save_waitlist(
+    entry_id = await save_waitlist(
         email=input.email,
         doc_type=input.document_type,
         text_preview=input.document_text
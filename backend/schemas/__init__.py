@@ -1,8 +1,8 @@
 from schemas.common import (
     DocumentInput, Coverage, ExtractedPolicy, FieldConfidence,
     COIData, ExtractionMetadata, ComplianceRequirement, ComplianceReport,
-    COIComplianceInput, OCRInput, ClassifyInput, ClassifyResult,
-    WaitlistInput, WaitlistResponse
+    COIComplianceInput, BatchCOIComplianceInput, BatchCOIResult, OCRInput, ClassifyInput, ClassifyResult,
+    WaitlistInput, WaitlistResponse, ReprocessInput
 )
 from schemas.auth import SignupInput, LoginInput, AuthResponse, UserInfo, CheckoutInput
 from schemas.lease import LeaseInsuranceClause, LeaseRedFlag, LeaseAnalysisInput, LeaseAnalysisReport
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional
 
 
@@ -8,6 +8,8 @@ class DocumentInput(BaseModel):
 
 
 class Coverage(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     type: str
     limit: str
     deductible: Optional[str] = None
@@ -15,6 +17,8 @@ class Coverage(BaseModel):
 
 
 class FieldConfidence(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     level: str
     reason: Optional[str] = None
     source_quote: Optional[str] = None
@@ -44,12 +48,14 @@ class COIData(BaseModel):
 class ExtractionMetadata(BaseModel):
     overall_confidence: float
     needs_human_review: bool
-    review_reasons: list[str] = []
-    low_confidence_fields: list[str] = []
+    review_reasons: list[str] = Field(default_factory=list)
+    low_confidence_fields: list[str] = Field(default_factory=list)
     extraction_notes: Optional[str] = None
 
 
 class ComplianceRequirement(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     required_value: str
     actual_value: str
@@ -60,9 +66,9 @@ class ComplianceRequirement(BaseModel):
 class ComplianceReport(BaseModel):
     overall_status: str
     coi_data: COIData
-    critical_gaps: list[ComplianceRequirement] = []
-    warnings: list[ComplianceRequirement] = []
-    passed: list[ComplianceRequirement] = []
+    critical_gaps: list[ComplianceRequirement] = Field(default_factory=list)
+    warnings: list[ComplianceRequirement] = Field(default_factory=list)
+    passed: list[ComplianceRequirement] = Field(default_factory=list)
     risk_exposure: str
     fix_request_letter: str
     extraction_metadata: Optional[ExtractionMetadata] = None
@@ -70,11 +76,11 @@ class ComplianceReport(BaseModel):
     is_premium: bool = False
     total_issues: Optional[int] = None
 
-    def __init__(self, **data):
-        for field in ['critical_gaps', 'warnings', 'passed']:
-            if data.get(field) is None:
-                data[field] = []
-        super().__init__(**data)
+    @field_validator('critical_gaps', 'warnings', 'passed', mode='before')
+    @classmethod
+    def _none_to_empty_list(cls, value):
+        # LLMs return null for empty lists
+        return [] if value is None else value
 
 
 class COIComplianceInput(BaseModel):
@@ -84,6 +90,23 @@ class COIComplianceInput(BaseModel):
     state: Optional[str] = None
 
 
+# Upper bound on COIs per batch request; each one is an LLM call
+MAX_BATCH_COIS = 50
+
+
+class BatchCOIComplianceInput(BaseModel):
+    coi_texts: list[str] = Field(max_length=MAX_BATCH_COIS)
+    project_type: Optional[str] = None
+    custom_requirements: Optional[dict] = None
+    state: Optional[str] = None
+
+
+class BatchCOIResult(BaseModel):
+    """One batch item: the report, or the error that COI failed with"""
+    report: Optional[ComplianceReport] = None
+    error: Optional[str] = None
+
+
 class OCRInput(BaseModel):
     file_data: str
     file_type: str
@@ -95,6 +118,8 @@ class ClassifyInput(BaseModel):
 
 
 class ClassifyResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     document_type: str
     confidence: float
     description: str
@@ -102,24 +127,26 @@ class ClassifyResult(BaseModel):
 
 
 class ExtractedPolicy(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     insured_name: Optional[str] = None
     policy_number: Optional[str] = None
     carrier: Optional[str] = None
     effective_date: Optional[str] = None
     expiration_date: Optional[str] = None
-    coverages: Optional[list[Coverage]] = []
+    coverages: list[Coverage] = Field(default_factory=list)
     total_premium: Optional[str] = None
-    exclusions: Optional[list[str]] = []
-    special_conditions: Optional[list[str]] = []
+    exclusions: list[str] = Field(default_factory=list)
+    special_conditions: list[str] = Field(default_factory=list)
     risk_score: Optional[int] = None
-    compliance_issues: Optional[list[str]] = []
+    compliance_issues: list[str] = Field(default_factory=list)
     summary: Optional[str] = None
 
-    def __init__(self, **data):
-        for field in ['coverages', 'exclusions', 'special_conditions', 'compliance_issues']:
-            if data.get(field) is None:
-                data[field] = []
-        super().__init__(**data)
+    @field_validator('coverages', 'exclusions', 'special_conditions', 'compliance_issues', mode='before')
+    @classmethod
+    def _none_to_empty_list(cls, value):
+        # LLMs return null for empty lists
+        return [] if value is None else value
 
 
 class WaitlistInput(BaseModel):
@@ -131,3 +158,7 @@ class WaitlistInput(BaseModel):
 class WaitlistResponse(BaseModel):
     success: bool
     message: str
+
+
+class ReprocessInput(BaseModel):
+    upload_ids: list[int]
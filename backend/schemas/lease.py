@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 
 class LeaseInsuranceClause(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     clause_type: str
     original_text: str
     summary: str
@@ -12,6 +14,8 @@ class LeaseInsuranceClause(BaseModel):
 
 
 class LeaseRedFlag(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     severity: str
     clause_text: Optional[str]
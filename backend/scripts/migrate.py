@@ -0,0 +1,43 @@
+"""Create database tables and indexes; run once per deploy instead of on every worker boot"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+import database
+import models  # noqa: F401  (registers the tables on Base.metadata)
+
+
+# Columns the models declare as JSONB on Postgres; other json columns are left alone
+JSONB_COLUMNS = [("uploads", "analysis_result")]
+
+
+def upgrade_json_columns(engine):
+    """Convert JSONB_COLUMNS still stored as json from before the switch to JSONB"""
+    with engine.begin() as conn:
+        for table, column in JSONB_COLUMNS:
+            data_type = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+            ), {"table": table, "column": column}).scalar()
+            if data_type == "json":
+                conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE jsonb USING "{column}"::jsonb'))
+
+
+def main():
+    if not database.init_db(create_tables=True):
+        # Deploys without a database have nothing to migrate; don't fail the pre-deploy step
+        print("Skipping migrations: no database configured")
+        return
+    # create_all skips indexes on tables that already exist
+    for table in database.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=database.db_engine, checkfirst=True)
+    if database.db_engine.dialect.name == "postgresql":
+        upgrade_json_columns(database.db_engine)
+
+
+if __name__ == "__main__":
+    main()
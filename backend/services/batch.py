@@ -0,0 +1,135 @@
+import asyncio
+
+import orjson
+from sqlalchemy import select, update
+
+from config import OPENAI_MODEL
+from database import run_in_session
+from models import Upload
+from services.llm import get_client, parse_json_reply
+from prompts.freelancer import FREELANCER_ANALYSIS_PROMPT
+from prompts.influencer import INFLUENCER_ANALYSIS_PROMPT
+from prompts.insurance_policy import INSURANCE_POLICY_ANALYSIS_PROMPT
+from prompts.auto_purchase import AUTO_PURCHASE_ANALYSIS_PROMPT
+from prompts.home_improvement import HOME_IMPROVEMENT_ANALYSIS_PROMPT
+from prompts.nursing_home import NURSING_HOME_ANALYSIS_PROMPT
+from prompts.subscription import SUBSCRIPTION_ANALYSIS_PROMPT
+from prompts.debt_settlement import DEBT_SETTLEMENT_ANALYSIS_PROMPT
+
+
+# Single-step analyzers whose prompt can be rebuilt from a stored upload (text + state).
+# Optional dollar inputs aren't stored, so they're sent as "Not specified".
+REPROCESS_PROMPTS = {
+    "freelancer": lambda text, state: FREELANCER_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], project_value="Not specified"),
+    "influencer": lambda text, state: INFLUENCER_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], base_rate="Not specified"),
+    "insurance_policy": lambda text, state: INSURANCE_POLICY_ANALYSIS_PROMPT.format(
+        policy_text=text[:15000], policy_type="Determine from text", state=state or "Not specified"),
+    "auto_purchase": lambda text, state: AUTO_PURCHASE_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], state=state or "Not specified",
+        vehicle_price="Not specified", trade_in_value="Not specified"),
+    "home_improvement": lambda text, state: HOME_IMPROVEMENT_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], state=state or "Not specified", project_cost="Not specified"),
+    "nursing_home": lambda text, state: NURSING_HOME_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], state=state or "Not specified"),
+    "subscription": lambda text, state: SUBSCRIPTION_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], monthly_cost="Not specified"),
+    "debt_settlement": lambda text, state: DEBT_SETTLEMENT_ANALYSIS_PROMPT.format(
+        contract_text=text[:15000], state=state or "Not specified", debt_amount="Not specified"),
+}
+
+BATCH_DONE_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+async def build_batch_requests(upload_ids: list[int]) -> tuple[bytes, list[int]]:
+    """Build the Batch API JSONL for the given uploads; returns (jsonl, ids included)"""
+    uploads = await run_in_session(lambda db: db.execute(
+        select(Upload.id, Upload.document_type, Upload.document_text, Upload.state)
+        .where(Upload.id.in_(upload_ids))
+    ).all())
+    if not uploads:
+        return b"", []
+
+    lines = []
+    included = []
+    for upload_id, doc_type, text, state in uploads:
+        build_prompt = REPROCESS_PROMPTS.get(doc_type)
+        if build_prompt is None or not text:
+            continue
+        lines.append(orjson.dumps({
+            "custom_id": str(upload_id),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OPENAI_MODEL,
+                "max_completion_tokens": 4096,
+                "messages": [{"role": "user", "content": build_prompt(text, state)}],
+            },
+        }))
+        included.append(upload_id)
+    return b"\n".join(lines), included
+
+
+async def submit_batch(jsonl: bytes):
+    """Upload the JSONL and start a 24h chat-completions batch"""
+    client = get_client()
+    batch_file = await client.files.create(file=("reprocess.jsonl", jsonl), purpose="batch")
+    return await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+
+async def wait_for_batch(batch_id: str, poll_interval: float = 30):
+    """Poll until the batch reaches a terminal status (for scripts; the admin API polls on demand)"""
+    client = get_client()
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status in BATCH_DONE_STATUSES:
+            return batch
+        await asyncio.sleep(poll_interval)
+
+
+def _update_uploads(db, rows: list[dict]) -> int:
+    # ORM bulk UPDATE by primary key: one executemany instead of a statement per row
+    db.execute(update(Upload), rows)
+    return len(rows)
+
+
+async def apply_batch_output(batch) -> int:
+    """Write a completed batch's results back to uploads.analysis_result in one bulk update"""
+    if not batch.output_file_id:
+        return 0
+    content = await get_client().files.content(batch.output_file_id)
+
+    rows = []
+    for line in content.text.splitlines():
+        if not line:
+            continue
+        item = orjson.loads(line)
+        response = item.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        try:
+            analysis = parse_json_reply(response["body"]["choices"][0]["message"]["content"])
+        except (orjson.JSONDecodeError, KeyError, IndexError) as e:
+            print(f"Skipping batch result for upload {item.get('custom_id')}: {e}")
+            continue
+        rows.append({
+            "id": int(item["custom_id"]),
+            "analysis_result": analysis,
+            "overall_risk": analysis.get("overall_risk"),
+            "risk_score": analysis.get("risk_score"),
+            "red_flag_count": len(analysis.get("red_flags", [])),
+        })
+
+    if not rows:
+        return 0
+
+    try:
+        return await run_in_session(lambda db: _update_uploads(db, rows)) or 0
+    except Exception as e:
+        print(f"Error applying batch output: {e}")
+        return 0
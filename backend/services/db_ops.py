@@ -1,57 +1,74 @@
-from database import get_db
+from sqlalchemy import insert
+
+from database import run_in_session
 from models import Upload, Waitlist
 
+BULK_INSERT_CHUNK = 500
+
+
+def upload_row(doc_type: str, text: str, state: str = None, analysis: dict = None, user_agent: str = None, user_id: int = None) -> dict:
+    """Column values for an Upload row"""
+    return {
+        "document_type": doc_type,
+        "document_text": text,
+        "text_length": len(text),
+        "state": state,
+        "analysis_result": analysis,
+        "overall_risk": analysis.get("overall_risk") if analysis else None,
+        "risk_score": analysis.get("risk_score") if analysis else None,
+        "red_flag_count": len(analysis.get("red_flags", [])) if analysis else None,
+        "user_agent": user_agent,
+        "user_id": user_id,
+    }
 
-def save_upload(doc_type: str, text: str, state: str = None, analysis: dict = None, user_agent: str = None, user_id: int = None):
-    """Save an upload to the database"""
-    db = get_db()
-    if db is None:
-        return None  # No database configured
 
+async def save_upload(doc_type: str, text: str, state: str = None, analysis: dict = None, user_agent: str = None, user_id: int = None):
+    """Save an upload to the database"""
+    row = upload_row(doc_type, text, state, analysis, user_agent, user_id)
     try:
-        upload = Upload(
-            document_type=doc_type,
-            document_text=text,
-            text_length=len(text),
-            state=state,
-            analysis_result=analysis,
-            overall_risk=analysis.get("overall_risk") if analysis else None,
-            risk_score=analysis.get("risk_score") if analysis else None,
-            red_flag_count=len(analysis.get("red_flags", [])) if analysis else None,
-            user_agent=user_agent,
-            user_id=user_id
+        # Core INSERT ... RETURNING: one round-trip, no ORM identity-map bookkeeping
+        return await run_in_session(
+            lambda db: db.scalar(insert(Upload).values(**row).returning(Upload.id))
         )
-        db.add(upload)
-        db.commit()
-        db.refresh(upload)
-        return upload.id
     except Exception as e:
         print(f"Error saving upload: {e}")
-        db.rollback()
         return None
-    finally:
-        db.close()
 
 
-def save_waitlist(email: str, doc_type: str, text_preview: str = None):
-    """Save a waitlist signup"""
-    db = get_db()
-    if db is None:
-        return None
+def _insert_uploads(db, rows: list[dict]) -> list[int]:
+    # One multi-row INSERT ... RETURNING per chunk instead of a round-trip per row
+    ids = []
+    for i in range(0, len(rows), BULK_INSERT_CHUNK):
+        ids.extend(db.scalars(insert(Upload).returning(Upload.id), rows[i:i + BULK_INSERT_CHUNK]).all())
+    return ids
+
 
+async def save_uploads_bulk(rows: list[dict]) -> list[int]:
+    """Save many upload rows (see upload_row) in one transaction; returns their ids"""
+    if not rows:
+        return []
     try:
-        entry = Waitlist(
-            email=email,
-            document_type=doc_type,
-            document_text_preview=text_preview[:500] if text_preview else None
-        )
-        db.add(entry)
-        db.commit()
-        db.refresh(entry)
-        return entry.id
+        return await run_in_session(lambda db: _insert_uploads(db, rows)) or []
+    except Exception as e:
+        print(f"Error saving uploads: {e}")
+        return []
+
+
+def _insert_waitlist(db, email: str, doc_type: str, text_preview: str = None) -> int:
+    entry = Waitlist(
+        email=email,
+        document_type=doc_type,
+        document_text_preview=text_preview[:500] if text_preview else None
+    )
+    db.add(entry)
+    db.flush()
+    return entry.id
+
+
+async def save_waitlist(email: str, doc_type: str, text_preview: str = None):
+    """Save a waitlist signup"""
+    try:
+        return await run_in_session(lambda db: _insert_waitlist(db, email, doc_type, text_preview))
     except Exception as e:
         print(f"Error saving waitlist: {e}")
-        db.rollback()
         return None
-    finally:
-        db.close()
@@ -1,7 +1,15 @@
-from openai import OpenAI
+import time
+import asyncio
+import hashlib
+from functools import lru_cache, partial
+
+import httpx
+import orjson
+from openai import AsyncOpenAI
 from fastapi import HTTPException
 
-from config import get_api_key, MOCK_MODE
+from config import get_api_key, MOCK_MODE, OPENAI_TIMEOUT, OPENAI_MAX_RETRIES, OPENAI_MAX_CONCURRENT, OPENAI_RPM, OPENAI_TPM, LLM_CACHE_SIZE, LLM_CACHE_TTL
+from services.cache import LRUCache
 
 
 # Lazy client initialization
@@ -19,22 +27,177 @@ def get_client():
                 status_code=500,
                 detail="OPENAI_API_KEY not configured. Set it in environment, .env file, or ~/.openai/api_key"
             )
-        _client = OpenAI(api_key=api_key)
+        # Keep-alive HTTP/2 pool so concurrent calls multiplex over warm
+        # connections to api.openai.com instead of opening new ones
+        _client = AsyncOpenAI(
+            api_key=api_key,
+            # Bound every awaited call so a stalled request can't pin a handler forever
+            timeout=OPENAI_TIMEOUT,
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+            ),
+        )
     return _client
 
 
+class TokenBucket:
+    """Proactive RPM/TPM throttle: callers sleep until there is capacity instead of hitting 429s"""
+
+    def __init__(self, capacity_rpm: int, capacity_tpm: int):
+        self.capacity_rpm = capacity_rpm
+        self.capacity_tpm = capacity_tpm
+        self.requests = float(capacity_rpm)
+        self.tokens = float(capacity_tpm)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.requests = min(self.capacity_rpm, self.requests + elapsed * self.capacity_rpm / 60)
+        self.tokens = min(self.capacity_tpm, self.tokens + elapsed * self.capacity_tpm / 60)
+
+    async def acquire(self, tokens: int):
+        tokens = min(tokens, self.capacity_tpm)
+        # One waiter at a time so callers are served in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.requests >= 1 and self.tokens >= tokens:
+                    self.requests -= 1
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep(max(
+                    (1 - self.requests) * 60 / self.capacity_rpm,
+                    (tokens - self.tokens) * 60 / self.capacity_tpm,
+                ))
+
+
+_openai_sem = asyncio.Semaphore(OPENAI_MAX_CONCURRENT)
+_rate_limiter = TokenBucket(OPENAI_RPM, OPENAI_TPM)
+# Exact-match response cache: resubmitting the same document with the same
+# prompt (re-uploads, /api/compare with a repeated quote) costs no API call
+_response_cache = LRUCache(maxsize=LLM_CACHE_SIZE)
+
+
+def _estimate_tokens(messages: list, max_completion_tokens: int) -> int:
+    """Rough token estimate (~4 chars per token) plus the completion budget, as OpenAI counts it"""
+    chars = 0
+    for message in messages:
+        content = message["content"]
+        if isinstance(content, str):
+            chars += len(content)
+        else:
+            chars += sum(len(part.get("text", "")) for part in content)
+    return chars // 4 + max_completion_tokens
+
+
+def _cache_key(kwargs: dict) -> str:
+    """SHA-256 of the model, messages and options; any prompt change yields a new key"""
+    return hashlib.sha256(orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _is_complete_reply(response, validate) -> bool:
+    """True for a finished, non-refused reply whose content passes validate"""
+    choice = response.choices[0]
+    if choice.finish_reason != "stop" or choice.message.content is None:
+        return False
+    try:
+        validate(choice.message.content)
+    except Exception:
+        return False
+    return True
+
+
+async def _throttled_call(create, cache_key, validate, kwargs):
+    """Make one API call under the shared throttle; cache the response under cache_key if validate accepts it"""
+    if cache_key is not None:
+        cached = _response_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+    await _rate_limiter.acquire(_estimate_tokens(kwargs["messages"], kwargs.get("max_completion_tokens", 0)))
+    async with _openai_sem:
+        response = await create(**kwargs)
+    if cache_key is not None and _is_complete_reply(response, validate):
+        _response_cache.set(cache_key, (time.monotonic() + LLM_CACHE_TTL, response))
+    return response
+
+
+async def create_chat_completion(validate=None, **kwargs):
+    """Throttled chat.completions.create; every LLM call goes through here.
+
+    Pass validate (the parser the caller applies to the reply) to cache the response for
+    identical requests; only complete replies that parse are cached. Streaming calls go
+    through stream_chat_completion instead.
+    """
+    cacheable = validate is not None and LLM_CACHE_TTL > 0
+    cache_key = _cache_key(kwargs) if cacheable else None
+    return await _throttled_call(get_client().chat.completions.create, cache_key, validate, kwargs)
+
+
+async def parse_chat_completion(response_format, **kwargs):
+    """Throttled, cached beta.chat.completions.parse; message.parsed is a response_format instance"""
+    cache_key = None
+    if LLM_CACHE_TTL > 0:
+        cache_key = _cache_key({**kwargs, "response_format": f"{response_format.__module__}.{response_format.__qualname__}"})
+    create = partial(get_client().beta.chat.completions.parse, response_format=response_format)
+    return await _throttled_call(create, cache_key, response_format.model_validate_json, kwargs)
+
+
+async def stream_chat_completion(**kwargs):
+    """Throttled streaming chat.completions.create; yields the chunks.
+
+    The concurrency slot is held until the stream is consumed or closed, so a streamed
+    reply counts against OPENAI_MAX_CONCURRENT for as long as it is generating.
+    """
+    await _rate_limiter.acquire(_estimate_tokens(kwargs["messages"], kwargs.get("max_completion_tokens", 0)))
+    async with _openai_sem:
+        stream = await get_client().chat.completions.create(stream=True, **kwargs)
+        async with stream:
+            async for chunk in stream:
+                yield chunk
+
+
+async def warm_up_client():
+    """Create the client and open a connection at startup so the first user doesn't pay for the handshake"""
+    if MOCK_MODE:
+        return
+    try:
+        await get_client().models.list()
+    except Exception as e:
+        print(f"OpenAI client warm-up failed: {e}")
+
+
+async def close_client():
+    """Close the shared client's connection pool on shutdown"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
 def clean_llm_response(response_text: str) -> str:
     """Clean up potential markdown formatting from LLM JSON responses.
 
     Handles the common pattern where LLMs wrap JSON in ```json``` code blocks.
     """
     if response_text.startswith("```"):
-        response_text = response_text.split("```")[1]
-        if response_text.startswith("json"):
-            response_text = response_text[4:]
+        # Slice out the first fenced block without splitting the whole response
+        start = 7 if response_text.startswith("json", 3) else 3
+        end = response_text.find("```", 3)
+        response_text = response_text[start:end] if end != -1 else response_text[start:]
     return response_text.strip()
 
 
+
+def parse_json_reply(content: str):
+    """Parse a JSON LLM reply, markdown fence and all"""
+    return orjson.loads(clean_llm_response(content))
+
+@lru_cache(maxsize=4096)
 def parse_limit_to_number(limit_str: str) -> int:
     """Parse a limit string like '$1,000,000' or '$1M' to an integer"""
     if not limit_str:
@@ -1,4 +1,5 @@
 from services.mock.extract import mock_extract
+from services.mock.classify import mock_classify
 from services.mock.coi import mock_coi_extract, mock_compliance_check, parse_limit_to_number
 from services.mock.lease import mock_lease_analysis
 from services.mock.gym import mock_gym_analysis
@@ -15,6 +16,7 @@ from services.mock.debt_settlement import mock_debt_settlement_analysis
 
 __all__ = [
     "mock_extract",
+    "mock_classify",
     "mock_coi_extract",
     "mock_compliance_check",
     "parse_limit_to_number",
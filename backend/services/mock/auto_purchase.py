@@ -173,11 +173,9 @@ def mock_auto_purchase_analysis(contract_text: str, state: str = None, vehicle_p
         summary += f"There are {warning_count} additional items you should negotiate or decline."
 
     # Generate demand letter
-    letter_items = []
-    for rf in red_flags:
-        if rf['severity'] in ('critical', 'warning'):
-            letter_items.append(f"- {rf['name']}: {rf['what_to_ask']}")
+    letter_items = [f"- {rf['name']}: {rf['what_to_ask']}" for rf in red_flags if rf['severity'] in ('critical', 'warning')]
 
+    items = "\n".join(letter_items) if letter_items else '- No critical issues identified'
     demand_letter = f"""RE: Vehicle Purchase Agreement - Objections and Requested Modifications
 
 Dear Dealer/Finance Manager,
@@ -185,7 +183,7 @@ Dear Dealer/Finance Manager,
 I have reviewed the purchase agreement and identified the following issues that must be addressed before I will proceed:
 
 ISSUES IDENTIFIED:
-{chr(10).join(letter_items) if letter_items else '- No critical issues identified'}
+{items}
 
 DEMANDS:
 1. Remove all add-on products I did not explicitly request
@@ -0,0 +1,32 @@
+def mock_classify(text: str) -> str:
+    """Keyword-based document type for mock mode; returns a SUPPORTED_DOC_TYPES key"""
+    text_lower = text.lower()
+    if 'certificate' in text_lower and ('insurance' in text_lower or 'liability' in text_lower):
+        return "coi"
+    if 'lease' in text_lower or ('landlord' in text_lower and 'tenant' in text_lower):
+        return "lease"
+    if 'gym' in text_lower or 'fitness' in text_lower or ('membership' in text_lower and ('cancel' in text_lower or 'dues' in text_lower)):
+        return "gym_contract"
+    if 'timeshare' in text_lower or 'vacation ownership' in text_lower or ('resort' in text_lower and 'maintenance fee' in text_lower):
+        return "timeshare_contract"
+    if 'influencer' in text_lower or 'brand deal' in text_lower or ('content' in text_lower and 'usage rights' in text_lower) or 'sponsorship' in text_lower:
+        return "influencer_contract"
+    if 'independent contractor' in text_lower or 'freelance' in text_lower or ('contractor' in text_lower and 'deliverables' in text_lower):
+        return "freelancer_contract"
+    if 'employment' in text_lower or 'non-compete' in text_lower or ('employee' in text_lower and ('arbitration' in text_lower or 'at-will' in text_lower)):
+        return "employment_contract"
+    if 'policy' in text_lower and 'premium' in text_lower:
+        return "insurance_policy"
+    if ('vehicle' in text_lower or 'dealer' in text_lower or 'vin' in text_lower) and ('purchase' in text_lower or 'financing' in text_lower or 'buyer' in text_lower):
+        return "auto_purchase"
+    if ('contractor' in text_lower or 'renovation' in text_lower or 'remodel' in text_lower) and ('scope' in text_lower or 'completion' in text_lower or 'lien' in text_lower or 'home improvement' in text_lower):
+        return "home_improvement"
+    if 'nursing' in text_lower or 'assisted living' in text_lower or ('admission' in text_lower and ('facility' in text_lower or 'resident' in text_lower)):
+        return "nursing_home"
+    if 'subscription' in text_lower or 'auto-renew' in text_lower or ('recurring' in text_lower and 'billing' in text_lower) or 'saas' in text_lower:
+        return "subscription"
+    if ('debt' in text_lower or 'settlement' in text_lower) and ('creditor' in text_lower or 'collection' in text_lower or 'paid in full' in text_lower or 'balance' in text_lower):
+        return "debt_settlement"
+    if 'agreement' in text_lower or 'contract' in text_lower:
+        return "contract"
+    return "unknown"
@@ -1,13 +1,137 @@
 import re
-
-from data.states import (
-    STATE_WORKERS_COMP,
-    STATE_ANTI_INDEMNITY,
-    STATE_GL_REQUIREMENTS,
-    STATE_AUTO_MINIMUMS,
+from functools import lru_cache
+from itertools import chain
+from typing import NamedTuple, Optional, TypedDict
+
+from data.states import STATE_RULES, STATE_AI_EXPLANATIONS
+from services.mock.text import lower_same_length, captured
+
+# Compiled once at import; bound .search methods skip the attribute lookup per call.
+# As in mock_extract, patterns are lowercase and run on the lowered text without
+# re.IGNORECASE, behind a literal probe that skips scans that can't match.
+_find_insured = tuple((literal, re.compile(p).search) for literal, p in (
+    ('insured', r'insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|policy|$)'),
+    ('named insured', r'named insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|dba|$)'),
+))
+_find_gl_per_occ = ('occurrence', re.compile(r'(?:each occurrence|per occurrence)[:\s]*\$?([\d,]+)').search)
+_find_gl_agg = ('aggregate', re.compile(r'(?:general aggregate|aggregate)[:\s]*\$?([\d,]+)').search)
+_find_ai_box = ('[x]', re.compile(r'\[x\]\s*additional\s*insured').search)
+_find_ai_checked = ('checked', re.compile(r'additional\s*insured.*checked').search)
+_find_wos_box = ('[x]', re.compile(r'\[x\]\s*waiver\s*of\s*subrogation').search)
+_find_wos_checked = ('checked', re.compile(r'waiver\s*of\s*subrogation.*checked').search)
+_find_cert_holder = ('certificate holder', re.compile(r'certificate holder[:\s]*\n?([A-Za-z\s&.,\n]+?)(?:\n\n|$)').search)
+_find_umbrella = ('umbrella', re.compile(r'umbrella[:\s]*\$?([\d,MmKk]+)').search)
+
+
+def _probe(pattern, text_lower: str):
+    """Run a (literal, search) pair on the lowered text"""
+    literal, find = pattern
+    return literal in text_lower and find(text_lower)
+
+
+class COIFields(TypedDict, total=False):
+    """Shape of the extracted COI dict passed between extraction and the compliance check"""
+    insured_name: Optional[str]
+    policy_number: Optional[str]
+    carrier: Optional[str]
+    effective_date: Optional[str]
+    expiration_date: Optional[str]
+    gl_limit_per_occurrence: Optional[str]
+    gl_limit_aggregate: Optional[str]
+    workers_comp: bool
+    auto_liability: bool
+    umbrella_limit: Optional[str]
+    additional_insured_checked: bool
+    waiver_of_subrogation_checked: bool
+    primary_noncontributory: bool
+    certificate_holder: Optional[str]
+    description_of_operations: Optional[str]
+    cg_20_10_endorsement: bool
+    cg_20_37_endorsement: bool
+
+
+class Finding(NamedTuple):
+    """A single compliance check result, converted to a dict only for the report"""
+    name: str
+    required_value: str
+    actual_value: str
+    status: str
+    explanation: str
+    category: str = None  # internal key into GAP_WEIGHTS, not part of the report
+
+
+# Report fields only; zip() against these drops the internal category
+_REPORT_FIELDS = Finding._fields[:5]
+
+# Estimated liability exposure per critical gap category
+GAP_WEIGHTS = {
+    "gl": 1000000,  # Estimate $1M exposure per GL gap
+    "ai": 3500000,  # Based on real case outcomes
+    "waiver": 500000,
+}
+
+
+# Findings with no per-document values, built once and shared between reports
+_AI_PASSED = Finding(
+    name="Additional Insured Status",
+    required_value="Additional Insured box checked with proper endorsement",
+    actual_value="Box checked with endorsement referenced",
+    status="pass",
+    explanation="Additional insured status properly documented"
+)
+_AI_NO_ENDORSEMENT = Finding(
+    name="Additional Insured Endorsement",
+    required_value="CG 20 10 / CG 20 37 endorsement referenced",
+    actual_value="Box checked but no endorsement number listed",
+    status="warning",
+    explanation="Additional Insured box is checked but no specific endorsement (CG 20 10, CG 20 37) is referenced. Request confirmation of actual endorsement."
+)
+_AI_MISSING = Finding(
+    name="Additional Insured Status",
+    required_value="Must be named as Additional Insured",
+    actual_value="Additional Insured box NOT checked",
+    status="fail",
+    explanation="CRITICAL: Being listed as Certificate Holder does NOT make you an Additional Insured. The California scaffolding case (Pardee v. Pacific) resulted in $3.5M+ in damages when this distinction was ignored. Request endorsement CG 20 10 for ongoing operations.",
+    category="ai"
+)
+_WAIVER_PASSED = Finding(
+    name="Waiver of Subrogation",
+    required_value="Waiver of Subrogation required",
+    actual_value="Waiver of Subrogation checked",
+    status="pass",
+    explanation="Waiver of subrogation is in place"
+)
+_WAIVER_MISSING = Finding(
+    name="Waiver of Subrogation",
+    required_value="Waiver of Subrogation required",
+    actual_value="Waiver of Subrogation NOT checked",
+    status="fail",
+    explanation="Missing Waiver of Subrogation. This allows the subcontractor's insurer to sue you after paying a claim. Request this endorsement.",
+    category="waiver"
+)
+_WC_PASSED = Finding(
+    name="Workers Compensation",
+    required_value="Workers Compensation required",
+    actual_value="Workers Comp present",
+    status="pass",
+    explanation="Workers compensation coverage confirmed"
+)
+_WC_MISSING = Finding(
+    name="Workers Compensation",
+    required_value="Workers Compensation required",
+    actual_value="Workers Comp NOT shown",
+    status="fail",
+    explanation="No workers compensation coverage shown. This is required for all contractors with employees."
 )
 
 
+@lru_cache(maxsize=1024)
+def _fmt_money(amount: int) -> str:
+    """Format a dollar amount; the same few limits recur across checks"""
+    return f"${amount:,}"
+
+
+@lru_cache(maxsize=4096)
 def parse_limit_to_number(limit_str: str) -> int:
     """Parse a limit string like '$1,000,000' or '$1M' to an integer"""
     if not limit_str:
@@ -31,49 +155,48 @@ def parse_limit_to_number(limit_str: str) -> int:
         return 0
 
 
-def mock_coi_extract(text: str) -> dict:
+def mock_coi_extract(text: str) -> COIFields:
     """Generate mock COI extraction for testing"""
-    text_lower = text.lower()
+    text_lower = lower_same_length(text)
 
     # Try to extract insured name
     insured = None
-    for pattern in [r'insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|policy|$)',
-                    r'named insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|dba|$)']:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _find_insured:
+        match = _probe(pattern, text_lower)
         if match:
-            insured = match.group(1).strip()
+            insured = captured(text, match).strip()
             break
 
     # Extract GL limits
     gl_per_occ = None
     gl_agg = None
-    gl_match = re.search(r'(?:each occurrence|per occurrence)[:\s]*\$?([\d,]+)', text, re.IGNORECASE)
+    gl_match = _probe(_find_gl_per_occ, text_lower)
     if gl_match:
-        gl_per_occ = f"${gl_match.group(1)}"
-    agg_match = re.search(r'(?:general aggregate|aggregate)[:\s]*\$?([\d,]+)', text, re.IGNORECASE)
+        gl_per_occ = f"${captured(text, gl_match)}"
+    agg_match = _probe(_find_gl_agg, text_lower)
     if agg_match:
-        gl_agg = f"${agg_match.group(1)}"
+        gl_agg = f"${captured(text, agg_match)}"
 
     # Check for additional insured
-    ai_checked = bool(re.search(r'\[x\]\s*additional\s*insured', text, re.IGNORECASE)) or \
-                 bool(re.search(r'additional\s*insured.*checked', text, re.IGNORECASE)) or \
+    ai_checked = bool(_probe(_find_ai_box, text_lower)) or \
+                 bool(_probe(_find_ai_checked, text_lower)) or \
                  ('additional insured' in text_lower and '[x]' in text_lower)
 
     # Check for waiver of subrogation
-    wos_checked = bool(re.search(r'\[x\]\s*waiver\s*of\s*subrogation', text, re.IGNORECASE)) or \
-                  bool(re.search(r'waiver\s*of\s*subrogation.*checked', text, re.IGNORECASE))
+    wos_checked = bool(_probe(_find_wos_box, text_lower)) or \
+                  bool(_probe(_find_wos_checked, text_lower))
 
     # Certificate holder
     cert_holder = None
-    ch_match = re.search(r'certificate holder[:\s]*\n?([A-Za-z\s&.,\n]+?)(?:\n\n|$)', text, re.IGNORECASE)
+    ch_match = _probe(_find_cert_holder, text_lower)
     if ch_match:
-        cert_holder = ch_match.group(1).strip()
+        cert_holder = captured(text, ch_match).strip()
 
     # Umbrella limit
     umbrella = None
-    umb_match = re.search(r'umbrella[:\s]*\$?([\d,MmKk]+)', text, re.IGNORECASE)
+    umb_match = _probe(_find_umbrella, text_lower)
     if umb_match:
-        umbrella = f"${umb_match.group(1)}"
+        umbrella = f"${captured(text, umb_match)}"
 
     return {
         "insured_name": insured,
@@ -96,223 +219,187 @@ def mock_coi_extract(text: str) -> dict:
     }
 
 
-def mock_compliance_check(coi_data: dict, requirements: dict, state: str = None) -> dict:
+def mock_compliance_check(coi_data: COIFields, requirements: dict, state: str = None) -> dict:
     """Generate mock compliance check for testing"""
     critical_gaps = []
     warnings = []
     passed = []
-    state_warnings = []
 
-    # Get state-specific rules if state provided
+    # Bind the lookups once; they're used throughout the checks below
+    cget = coi_data.get
+    rget = requirements.get
+
     state_upper = state.upper() if state else None
-    wc_rules = STATE_WORKERS_COMP.get(state_upper) if state_upper else None
-    ai_rules = STATE_ANTI_INDEMNITY.get(state_upper) if state_upper else None
-    gl_rules = STATE_GL_REQUIREMENTS.get(state_upper) if state_upper else None
-    auto_rules = STATE_AUTO_MINIMUMS.get(state_upper) if state_upper else None
+
+    # Parse every dollar limit once up front; the checks below only read from here
+    limits = {
+        key: parse_limit_to_number(cget(key) or '')
+        for key in ('gl_limit_per_occurrence', 'gl_limit_aggregate', 'umbrella_limit')
+    }
 
     # Check GL per occurrence
-    coi_limit = parse_limit_to_number(coi_data.get('gl_limit_per_occurrence', '') or '')
-    req_limit = requirements.get('gl_per_occurrence', 1000000)
-    gl_per_occ_value = coi_data.get('gl_limit_per_occurrence') or 'Not specified'
+    coi_limit = limits['gl_limit_per_occurrence']
+    req_limit = rget('gl_per_occurrence', 1000000)
+    req_limit_fmt = _fmt_money(req_limit)
+    gl_per_occ_value = cget('gl_limit_per_occurrence') or 'Not specified'
     if coi_limit >= req_limit:
-        passed.append({
-            "name": "GL Per Occurrence Limit",
-            "required_value": f"${req_limit:,}",
-            "actual_value": gl_per_occ_value,
-            "status": "pass",
-            "explanation": "Limit meets or exceeds requirement"
-        })
+        passed.append(Finding(
+            name="GL Per Occurrence Limit",
+            required_value=req_limit_fmt,
+            actual_value=gl_per_occ_value,
+            status="pass",
+            explanation="Limit meets or exceeds requirement"
+        ))
     else:
-        critical_gaps.append({
-            "name": "GL Per Occurrence Limit",
-            "required_value": f"${req_limit:,}",
-            "actual_value": gl_per_occ_value,
-            "status": "fail",
-            "explanation": f"INADEQUATE COVERAGE: Limit is ${coi_limit:,} but contract requires ${req_limit:,}. This leaves a ${req_limit - coi_limit:,} gap in coverage."
-        })
+        critical_gaps.append(Finding(
+            name="GL Per Occurrence Limit",
+            required_value=req_limit_fmt,
+            actual_value=gl_per_occ_value,
+            status="fail",
+            explanation=f"INADEQUATE COVERAGE: Limit is {_fmt_money(coi_limit)} but contract requires {req_limit_fmt}. This leaves a {_fmt_money(req_limit - coi_limit)} gap in coverage.",
+            category="gl"
+        ))
 
     # Check GL aggregate
-    coi_agg = parse_limit_to_number(coi_data.get('gl_limit_aggregate', '') or '')
-    req_agg = requirements.get('gl_aggregate', 2000000)
-    gl_agg_value = coi_data.get('gl_limit_aggregate') or 'Not specified'
+    coi_agg = limits['gl_limit_aggregate']
+    req_agg = rget('gl_aggregate', 2000000)
+    req_agg_fmt = _fmt_money(req_agg)
+    gl_agg_value = cget('gl_limit_aggregate') or 'Not specified'
     if coi_agg >= req_agg:
-        passed.append({
-            "name": "GL Aggregate Limit",
-            "required_value": f"${req_agg:,}",
-            "actual_value": gl_agg_value,
-            "status": "pass",
-            "explanation": "Aggregate limit meets or exceeds requirement"
-        })
+        passed.append(Finding(
+            name="GL Aggregate Limit",
+            required_value=req_agg_fmt,
+            actual_value=gl_agg_value,
+            status="pass",
+            explanation="Aggregate limit meets or exceeds requirement"
+        ))
     else:
-        critical_gaps.append({
-            "name": "GL Aggregate Limit",
-            "required_value": f"${req_agg:,}",
-            "actual_value": gl_agg_value,
-            "status": "fail",
-            "explanation": f"INADEQUATE COVERAGE: Aggregate is ${coi_agg:,} but contract requires ${req_agg:,}."
-        })
+        critical_gaps.append(Finding(
+            name="GL Aggregate Limit",
+            required_value=req_agg_fmt,
+            actual_value=gl_agg_value,
+            status="fail",
+            explanation=f"INADEQUATE COVERAGE: Aggregate is {_fmt_money(coi_agg)} but contract requires {req_agg_fmt}.",
+            category="gl"
+        ))
 
     # Check Additional Insured (CRITICAL)
-    if requirements.get('additional_insured_required', True):
-        if coi_data.get('additional_insured_checked'):
-            if coi_data.get('cg_20_10_endorsement') or coi_data.get('cg_20_37_endorsement'):
-                passed.append({
-                    "name": "Additional Insured Status",
-                    "required_value": "Additional Insured box checked with proper endorsement",
-                    "actual_value": "Box checked with endorsement referenced",
-                    "status": "pass",
-                    "explanation": "Additional insured status properly documented"
-                })
+    if rget('additional_insured_required', True):
+        if cget('additional_insured_checked'):
+            if cget('cg_20_10_endorsement') or cget('cg_20_37_endorsement'):
+                passed.append(_AI_PASSED)
             else:
-                warnings.append({
-                    "name": "Additional Insured Endorsement",
-                    "required_value": "CG 20 10 / CG 20 37 endorsement referenced",
-                    "actual_value": "Box checked but no endorsement number listed",
-                    "status": "warning",
-                    "explanation": "Additional Insured box is checked but no specific endorsement (CG 20 10, CG 20 37) is referenced. Request confirmation of actual endorsement."
-                })
+                warnings.append(_AI_NO_ENDORSEMENT)
         else:
-            critical_gaps.append({
-                "name": "Additional Insured Status",
-                "required_value": "Must be named as Additional Insured",
-                "actual_value": "Additional Insured box NOT checked",
-                "status": "fail",
-                "explanation": "CRITICAL: Being listed as Certificate Holder does NOT make you an Additional Insured. The California scaffolding case (Pardee v. Pacific) resulted in $3.5M+ in damages when this distinction was ignored. Request endorsement CG 20 10 for ongoing operations."
-            })
+            critical_gaps.append(_AI_MISSING)
 
     # Check Waiver of Subrogation
-    if requirements.get('waiver_of_subrogation_required', True):
-        if coi_data.get('waiver_of_subrogation_checked'):
-            passed.append({
-                "name": "Waiver of Subrogation",
-                "required_value": "Waiver of Subrogation required",
-                "actual_value": "Waiver of Subrogation checked",
-                "status": "pass",
-                "explanation": "Waiver of subrogation is in place"
-            })
+    if rget('waiver_of_subrogation_required', True):
+        if cget('waiver_of_subrogation_checked'):
+            passed.append(_WAIVER_PASSED)
         else:
-            critical_gaps.append({
-                "name": "Waiver of Subrogation",
-                "required_value": "Waiver of Subrogation required",
-                "actual_value": "Waiver of Subrogation NOT checked",
-                "status": "fail",
-                "explanation": "Missing Waiver of Subrogation. This allows the subcontractor's insurer to sue you after paying a claim. Request this endorsement."
-            })
+            critical_gaps.append(_WAIVER_MISSING)
 
     # Check Workers Comp
-    if requirements.get('workers_comp_required', True):
-        if coi_data.get('workers_comp'):
-            passed.append({
-                "name": "Workers Compensation",
-                "required_value": "Workers Compensation required",
-                "actual_value": "Workers Comp present",
-                "status": "pass",
-                "explanation": "Workers compensation coverage confirmed"
-            })
+    if rget('workers_comp_required', True):
+        if cget('workers_comp'):
+            passed.append(_WC_PASSED)
         else:
-            critical_gaps.append({
-                "name": "Workers Compensation",
-                "required_value": "Workers Compensation required",
-                "actual_value": "Workers Comp NOT shown",
-                "status": "fail",
-                "explanation": "No workers compensation coverage shown. This is required for all contractors with employees."
-            })
+            critical_gaps.append(_WC_MISSING)
 
     # Check Umbrella if required
-    if requirements.get('umbrella_required', False):
-        umbrella_limit = parse_limit_to_number(coi_data.get('umbrella_limit', '') or '')
-        req_umbrella = requirements.get('umbrella_minimum', 2000000)
+    if rget('umbrella_required', False):
+        umbrella_value = cget('umbrella_limit')
+        umbrella_limit = limits['umbrella_limit']
+        req_umbrella = rget('umbrella_minimum', 2000000)
+        req_umbrella_fmt = _fmt_money(req_umbrella)
         if umbrella_limit >= req_umbrella:
-            passed.append({
-                "name": "Umbrella/Excess Liability",
-                "required_value": f"${req_umbrella:,} umbrella required",
-                "actual_value": coi_data.get('umbrella_limit') or 'Not specified',
-                "status": "pass",
-                "explanation": "Umbrella coverage meets requirement"
-            })
+            passed.append(Finding(
+                name="Umbrella/Excess Liability",
+                required_value=f"{req_umbrella_fmt} umbrella required",
+                actual_value=umbrella_value or 'Not specified',
+                status="pass",
+                explanation="Umbrella coverage meets requirement"
+            ))
         else:
-            warnings.append({
-                "name": "Umbrella/Excess Liability",
-                "required_value": f"${req_umbrella:,} umbrella required",
-                "actual_value": coi_data.get('umbrella_limit') or 'Not shown',
-                "status": "warning",
-                "explanation": f"Umbrella coverage is insufficient or not shown. Contract requires ${req_umbrella:,}."
-            })
-
-    # State-specific mitigation strategies for broad anti-indemnity states
-    STATE_MITIGATIONS = {
-        "AZ": "Consider CG 24 26 endorsement or higher primary limits on your own CGL.",
-        "CO": "Wrap-up/OCIP recommended for larger projects. Ensure contractual liability coverage on your policy.",
-        "GA": "Primary & non-contributory language remains valid. Verify your own CGL limits are adequate.",
-        "KS": "Wrap-up programs or higher umbrella limits on your own policy recommended.",
-        "MT": "OCIP/CCIP wrap-up insurance or project-specific coverage. Your own policy should be primary.",
-        "OR": "CG 24 26 amendment endorsement or contractual liability on your CGL.",
-    }
+            warnings.append(Finding(
+                name="Umbrella/Excess Liability",
+                required_value=f"{req_umbrella_fmt} umbrella required",
+                actual_value=umbrella_value or 'Not shown',
+                status="warning",
+                explanation=f"Umbrella coverage is insufficient or not shown. Contract requires {req_umbrella_fmt}."
+            ))
 
     # STATE-SPECIFIC CHECKS
     if state_upper:
+        # State tables are only looked up when a state was provided
+        rules = STATE_RULES.get(state_upper, {})
+        wc_rules = rules.get('wc')
+        ai_rules = rules.get('ai')
+        gl_rules = rules.get('gl')
+
         # Anti-Indemnity Statute Note (informational for AI coverage)
         if ai_rules:
             if ai_rules.get('voids_ai_for_sole_negligence'):
-                mitigation = STATE_MITIGATIONS.get(state_upper, "Review coverage with your broker.")
-                warnings.append({
-                    "name": f"{state_upper} Anti-Indemnity Note",
-                    "required_value": "AI coverage for shared fault",
-                    "actual_value": "Limited by state statute",
-                    "status": "warning",
-                    "explanation": f"{state_upper}'s broad anti-indemnity statute limits AI coverage when you share fault. {mitigation}"
-                })
+                warnings.append(Finding(
+                    name=f"{state_upper} Anti-Indemnity Note",
+                    required_value="AI coverage for shared fault",
+                    actual_value="Limited by state statute",
+                    status="warning",
+                    explanation=STATE_AI_EXPLANATIONS[state_upper]
+                ))
             elif ai_rules.get('type') not in ['None', None]:
-                warnings.append({
-                    "name": f"{state_upper} Anti-Indemnity",
-                    "required_value": "Standard AI coverage",
-                    "actual_value": f"{ai_rules.get('type')} statute applies",
-                    "status": "warning",
-                    "explanation": f"{ai_rules.get('type')} anti-indemnity statute. Insurance savings clause {'preserves AI coverage' if ai_rules.get('insurance_savings_clause') else 'does not apply'}."
-                })
+                warnings.append(Finding(
+                    name=f"{state_upper} Anti-Indemnity",
+                    required_value="Standard AI coverage",
+                    actual_value=f"{ai_rules.get('type')} statute applies",
+                    status="warning",
+                    explanation=f"{ai_rules.get('type')} anti-indemnity statute. Insurance savings clause {'preserves AI coverage' if ai_rules.get('insurance_savings_clause') else 'does not apply'}."
+                ))
 
         # Workers Comp State-Specific Rules
         if wc_rules:
             if not wc_rules.get('required'):
                 # Texas - only state where WC is optional
-                warnings.append({
-                    "name": f"{state_upper} Workers Comp",
-                    "required_value": "Workers Comp recommended",
-                    "actual_value": coi_data.get('workers_comp') and "Present" or "Not shown",
-                    "status": "warning" if not coi_data.get('workers_comp') else "pass",
-                    "explanation": f"{state_upper} is the only state where Workers' Compensation is fully voluntary. {wc_rules.get('construction_specific', '')} However, most contracts still require it. Non-subscribers face unlimited liability exposure."
-                })
+                has_wc = cget('workers_comp')
+                warnings.append(Finding(
+                    name=f"{state_upper} Workers Comp",
+                    required_value="Workers Comp recommended",
+                    actual_value="Present" if has_wc else "Not shown",
+                    status="pass" if has_wc else "warning",
+                    explanation=f"{state_upper} is the only state where Workers' Compensation is fully voluntary. {wc_rules.get('construction_specific', '')} However, most contracts still require it. Non-subscribers face unlimited liability exposure."
+                ))
             elif wc_rules.get('monopolistic'):
-                passed.append({
-                    "name": f"{state_upper} Monopolistic State Fund",
-                    "required_value": "State fund coverage",
-                    "actual_value": "Monopolistic state rules apply",
-                    "status": "pass",
-                    "explanation": f"{state_upper} is a monopolistic state - WC must be purchased through the state fund ({state_upper} State Insurance Fund). Private insurers cannot write WC here."
-                })
+                passed.append(Finding(
+                    name=f"{state_upper} Monopolistic State Fund",
+                    required_value="State fund coverage",
+                    actual_value="Monopolistic state rules apply",
+                    status="pass",
+                    explanation=f"{state_upper} is a monopolistic state - WC must be purchased through the state fund ({state_upper} State Insurance Fund). Private insurers cannot write WC here."
+                ))
             elif wc_rules.get('threshold') and wc_rules.get('threshold') > 1:
                 # States with higher thresholds
-                warnings.append({
-                    "name": f"{state_upper} WC Threshold",
-                    "required_value": f"WC required for {wc_rules.get('threshold')}+ employees",
-                    "actual_value": f"Construction rule: {wc_rules.get('construction_specific', 'Standard')}",
-                    "status": "warning",
-                    "explanation": f"{state_upper} requires WC for {wc_rules.get('threshold')}+ employees. Construction-specific: {wc_rules.get('construction_specific', '')}. Verify employee count threshold is met."
-                })
+                warnings.append(Finding(
+                    name=f"{state_upper} WC Threshold",
+                    required_value=f"WC required for {wc_rules.get('threshold')}+ employees",
+                    actual_value=f"Construction rule: {wc_rules.get('construction_specific', 'Standard')}",
+                    status="warning",
+                    explanation=f"{state_upper} requires WC for {wc_rules.get('threshold')}+ employees. Construction-specific: {wc_rules.get('construction_specific', '')}. Verify employee count threshold is met."
+                ))
 
         # State GL Requirements
         if gl_rules and gl_rules.get('required_for_license'):
             if gl_rules.get('minimum_per_occurrence'):
                 state_min = gl_rules.get('minimum_per_occurrence')
-                coi_limit = parse_limit_to_number(coi_data.get('gl_limit_per_occurrence', '') or '')
-                if coi_limit < state_min:
-                    warnings.append({
-                        "name": f"{state_upper} State GL Minimum",
-                        "required_value": f"${state_min:,} state minimum",
-                        "actual_value": coi_data.get('gl_limit_per_occurrence', 'Not specified'),
-                        "status": "warning",
-                        "explanation": f"{state_upper} requires minimum ${state_min:,} GL for contractor licensing. {gl_rules.get('notes', '')} Current coverage may not meet state licensing requirements."
-                    })
+                if limits['gl_limit_per_occurrence'] < state_min:
+                    state_min_fmt = _fmt_money(state_min)
+                    warnings.append(Finding(
+                        name=f"{state_upper} State GL Minimum",
+                        required_value=f"{state_min_fmt} state minimum",
+                        actual_value=cget('gl_limit_per_occurrence', 'Not specified'),
+                        status="warning",
+                        explanation=f"{state_upper} requires minimum {state_min_fmt} GL for contractor licensing. {gl_rules.get('notes', '')} Current coverage may not meet state licensing requirements."
+                    ))
 
     # Determine overall status
     if len(critical_gaps) > 0:
@@ -323,35 +410,25 @@ def mock_compliance_check(coi_data: dict, requirements: dict, state: str = None)
         overall_status = "compliant"
 
     # Calculate risk exposure
-    total_gap = 0
-    for gap in critical_gaps:
-        if 'GL' in gap['name']:
-            total_gap += 1000000  # Estimate $1M exposure per GL gap
-        elif 'Additional Insured' in gap['name']:
-            total_gap += 3500000  # Based on real case outcomes
-        elif 'Waiver' in gap['name']:
-            total_gap += 500000
+    total_gap = sum(GAP_WEIGHTS.get(gap.category, 0) for gap in critical_gaps)
 
-    risk_exposure = f"${total_gap:,}+ potential liability exposure" if total_gap > 0 else "Minimal risk exposure"
+    risk_exposure = f"{_fmt_money(total_gap)}+ potential liability exposure" if total_gap > 0 else "Minimal risk exposure"
 
     # Generate fix request letter
-    fix_items = []
-    for gap in critical_gaps:
-        fix_items.append(f"- {gap['name']}: {gap['explanation']}")
-    for warn in warnings:
-        fix_items.append(f"- {warn['name']}: {warn['explanation']}")
+    fix_items = [f"- {item.name}: {item.explanation}" for item in chain(critical_gaps, warnings)]
 
+    items = "\n".join(fix_items)
     fix_letter = f"""RE: Certificate of Insurance Compliance - Immediate Action Required
 
-Dear {coi_data.get('insured_name', '[Subcontractor Name]')},
+Dear {cget('insured_name', '[Subcontractor Name]')},
 
 We have reviewed the Certificate of Insurance submitted for your work on our project and identified the following compliance gaps that must be addressed before work can proceed:
 
 ITEMS REQUIRING CORRECTION:
-{chr(10).join(fix_items)}
+{items}
 
 Per our contract agreement, the following insurance requirements must be met:
-- General Liability: ${requirements.get('gl_per_occurrence', 1000000):,} per occurrence / ${requirements.get('gl_aggregate', 2000000):,} aggregate
+- General Liability: {req_limit_fmt} per occurrence / {req_agg_fmt} aggregate
 - Additional Insured endorsement (CG 20 10 for ongoing operations, CG 20 37 for completed operations)
 - Waiver of Subrogation endorsement
 - Workers Compensation at statutory limits
@@ -370,20 +447,20 @@ Regards,
     # Generate mock extraction metadata
     extraction_metadata = {
         "overall_confidence": 0.75,
-        "needs_human_review": len(critical_gaps) > 0 or not coi_data.get('additional_insured_checked'),
+        "needs_human_review": len(critical_gaps) > 0 or not cget('additional_insured_checked'),
         "review_reasons": [
             "Mock extraction - recommend verification with actual document"
-        ] + ([f"Critical gap: {gap['name']}" for gap in critical_gaps[:2]]),
-        "low_confidence_fields": ["cg_20_10_endorsement", "cg_20_37_endorsement"] if not coi_data.get('cg_20_10_endorsement') else [],
+        ] + ([f"Critical gap: {gap.name}" for gap in critical_gaps[:2]]),
+        "low_confidence_fields": ["cg_20_10_endorsement", "cg_20_37_endorsement"] if not cget('cg_20_10_endorsement') else [],
         "extraction_notes": "Mock extraction for testing purposes"
     }
 
     return {
         "overall_status": overall_status,
         "coi_data": coi_data,
-        "critical_gaps": critical_gaps,
-        "warnings": warnings,
-        "passed": passed,
+        "critical_gaps": [dict(zip(_REPORT_FIELDS, gap)) for gap in critical_gaps],
+        "warnings": [dict(zip(_REPORT_FIELDS, warn)) for warn in warnings],
+        "passed": [dict(zip(_REPORT_FIELDS, check)) for check in passed],
         "risk_exposure": risk_exposure,
         "fix_request_letter": fix_letter,
         "extraction_metadata": extraction_metadata
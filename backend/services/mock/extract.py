@@ -1,80 +1,101 @@
 import re
 
+from services.mock.text import lower_same_length, captured
+
+# Compiled once at import; bound .search methods skip the attribute lookup per call.
+# Patterns are lowercase and run on the lowered text without re.IGNORECASE (no per-char
+# case folding); captures are sliced from the original text by offset. Each pattern is
+# paired with a literal it can't match without, so a substring probe skips scans that would miss.
+_find_insured = tuple((literal, re.compile(p).search) for literal, p in (
+    ('insured', r'insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|policy|$)'),
+    ('named insured', r'named insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|dba|$)'),
+    ('prepared for', r'prepared for[:\s]+([A-Za-z\s&.,]+?)(?:\n|date|$)'),
+    ('policy for ', r'policy for ([A-Za-z\s]+?)\.'),
+))
+
+_find_policy_num = tuple((literal, re.compile(p).search) for literal, p in (
+    ('policy', r'policy\s*#[:\s]*([a-z]+-\d{4}-\d+)'),  # BOP-2024-88821
+    ('policy', r'policy\s*number[:\s]*([a-z]+-[a-z]+-\d{4}-\d+)'),  # CGL-NY-2023-44891
+    ('quote', r'quote\s*#[:\s]*([a-z]+-\d{4}-\d+)'),  # CPQ-2024-1182
+    ('-', r'([a-z]{2,4}-\d{4}-\d{4,})'),  # Generic policy number pattern
+    ('-', r'([a-z]{2,4}-[a-z]{2}-\d{4}-\d+)'),  # With state code
+))
+
+_find_carrier = tuple((literal, re.compile(p).search) for literal, p in (
+    ('carrier', r'carrier[:\s]+([A-Za-z\s]+?)(?:\n|eff|$)'),
+    ('underwritten by', r'underwritten by[:\s]+([A-Za-z\s]+?)(?:\n|$)'),
+    ('quoted by', r'quoted by[:\s]+([A-Za-z\s]+?)(?:\n|$)'),
+))
+
+_find_premium = tuple((literal, re.compile(p).search) for literal, p in (
+    ('premium', r'premium\s*(?:total)?[:\s]*\$?([\d,]+)(?:/yr)?'),
+    ('premium', r'annual\s*premium[:\s]*\$?([\d,]+)'),
+    ('premium', r'premium\s*increase[:\s]*\$?[\d,]+\s*->\s*\$?([\d,]+)'),
+    ('$', r'\$([\d,]+)\s*(?:/yr|per year|annually)'),
+))
+
+_find_coverages = tuple((literal, re.compile(p).search, cov_type) for literal, p, cov_type in (
+    ('gl', r'gl[:\s]+\$?([\d,MmKk]+)', 'General Liability'),
+    ('general liability', r'general liability[:\s\w]*\$?([\d,MmKk/]+)', 'General Liability'),
+    ('building coverage', r'building coverage[.\s]+\$?([\d,]+)', 'Building Coverage'),
+    ('business personal property', r'business personal property[.\s]+\$?([\d,]+)', 'Business Personal Property'),
+    ('business income', r'business income[.\s]+\$?([\d,]+)', 'Business Income'),
+    ('umbrella', r'umbrella[:\s]+\$?([\d,MmKk]+)', 'Umbrella'),
+    ('professional liability', r'professional liability[:\s\w]*\$?([\d,MmKk]+)', 'Professional Liability'),
+    ('equipment breakdown', r'equipment breakdown[.\s]+\$?([\d,]+)', 'Equipment Breakdown'),
+    ('coverage', r'coverage\s*\$?([\d,]+k?)', 'General Coverage'),
+))
+
 
 def mock_extract(text: str) -> dict:
     """Generate mock extraction based on document content for testing"""
-    text_lower = text.lower()
+    text_lower = lower_same_length(text)
 
     # Try to extract insured name
     insured = None
-    for pattern in [r'insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|policy|$)',
-                    r'named insured[:\s]+([A-Za-z\s&.,]+?)(?:\n|dba|$)',
-                    r'prepared for[:\s]+([A-Za-z\s&.,]+?)(?:\n|date|$)',
-                    r'policy for ([A-Za-z\s]+?)\.']:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for literal, find in _find_insured:
+        match = literal in text_lower and find(text_lower)
         if match:
-            insured = match.group(1).strip()
+            insured = captured(text, match).strip()
             break
 
     # Try to extract policy number - look for specific patterns
     policy_num = None
-    policy_patterns = [
-        r'policy\s*#[:\s]*([A-Z]+-\d{4}-\d+)',  # BOP-2024-88821
-        r'policy\s*number[:\s]*([A-Z]+-[A-Z]+-\d{4}-\d+)',  # CGL-NY-2023-44891
-        r'quote\s*#[:\s]*([A-Z]+-\d{4}-\d+)',  # CPQ-2024-1182
-        r'([A-Z]{2,4}-\d{4}-\d{4,})',  # Generic policy number pattern
-        r'([A-Z]{2,4}-[A-Z]{2}-\d{4}-\d+)',  # With state code
-    ]
-    for pattern in policy_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for literal, find in _find_policy_num:
+        match = literal in text_lower and find(text_lower)
         if match:
-            policy_num = match.group(1).upper()
+            policy_num = captured(text, match).upper()
             break
 
     # Try to extract carrier
     carrier = None
-    for pattern in [r'carrier[:\s]+([A-Za-z\s]+?)(?:\n|eff|$)',
-                    r'underwritten by[:\s]+([A-Za-z\s]+?)(?:\n|$)',
-                    r'quoted by[:\s]+([A-Za-z\s]+?)(?:\n|$)']:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for literal, find in _find_carrier:
+        match = literal in text_lower and find(text_lower)
         if match:
-            carrier = match.group(1).strip()
+            carrier = captured(text, match).strip()
             break
 
     # Try to extract premium - multiple patterns
     premium = None
-    premium_patterns = [
-        r'premium\s*(?:total)?[:\s]*\$?([\d,]+)(?:/yr)?',
-        r'annual\s*premium[:\s]*\$?([\d,]+)',
-        r'premium\s*increase[:\s]*\$?[\d,]+\s*->\s*\$?([\d,]+)',
-        r'\$([\d,]+)\s*(?:/yr|per year|annually)',
-    ]
-    for pattern in premium_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for literal, find in _find_premium:
+        match = literal in text_lower and find(text_lower)
         if match:
-            premium = f"${match.group(1)}"
+            premium = f"${captured(text, match)}"
             break
 
     # Extract coverages
     coverages = []
-    coverage_patterns = [
-        (r'GL[:\s]+\$?([\d,MmKk]+)', 'General Liability'),
-        (r'general liability[:\s\w]*\$?([\d,MmKk/]+)', 'General Liability'),
-        (r'building coverage[.\s]+\$?([\d,]+)', 'Building Coverage'),
-        (r'business personal property[.\s]+\$?([\d,]+)', 'Business Personal Property'),
-        (r'business income[.\s]+\$?([\d,]+)', 'Business Income'),
-        (r'umbrella[:\s]+\$?([\d,MmKk]+)', 'Umbrella'),
-        (r'professional liability[:\s\w]*\$?([\d,MmKk]+)', 'Professional Liability'),
-        (r'equipment breakdown[.\s]+\$?([\d,]+)', 'Equipment Breakdown'),
-        (r'coverage\s*\$?([\d,]+k?)', 'General Coverage'),
-    ]
-    for pattern, cov_type in coverage_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    seen_types = set()
+    for literal, find, cov_type in _find_coverages:
+        if cov_type in seen_types:
+            continue  # e.g. "general liability" after a "GL:" line already matched
+        match = literal in text_lower and find(text_lower)
         if match:
-            limit = match.group(1)
+            limit = captured(text, match)
             if not limit.startswith('$'):
                 limit = f"${limit}"
             coverages.append({"type": cov_type, "limit": limit, "deductible": None, "notes": None})
+            seen_types.add(cov_type)
 
     # Extract exclusions
     exclusions = []
@@ -137,14 +137,10 @@ def mock_lease_analysis(lease_text: str, state: str = None) -> dict:
         summary += f"It's also missing {len(missing)} standard tenant protections."
 
     # Generate negotiation letter
-    letter_items = []
-    for rf in red_flags:
-        if rf['severity'] == 'critical':
-            letter_items.append(f"- {rf['name']}: {rf['protection']}")
-
-    for missing_item in missing[:3]:
-        letter_items.append(f"- Add: {missing_item}")
+    letter_items = [f"- {rf['name']}: {rf['protection']}" for rf in red_flags if rf['severity'] == 'critical']
+    letter_items += [f"- Add: {missing_item}" for missing_item in missing[:3]]
 
+    items = "\n".join(letter_items) if letter_items else '- No critical changes required'
     letter = f"""RE: Lease Insurance and Liability Terms - Requested Modifications
 
 Dear Landlord,
@@ -152,7 +148,7 @@ Dear Landlord,
 We have reviewed the proposed lease agreement and identified several provisions that require modification before we can proceed:
 
 REQUESTED CHANGES:
-{chr(10).join(letter_items) if letter_items else '- No critical changes required'}
+{items}
 
 These modifications reflect standard commercial practice and appropriate risk allocation between landlord and tenant. We believe these changes are reasonable and look forward to discussing them.
 
@@ -0,0 +1,12 @@
+def lower_same_length(text: str) -> str:
+    """Lowercase text, keeping offsets aligned with the original"""
+    text_lower = text.lower()
+    if len(text_lower) != len(text):
+        # A few characters (e.g. 'İ') lowercase to two; keep just the base letter
+        text_lower = ''.join(ch.lower()[0] for ch in text)
+    return text_lower
+
+
+def captured(text: str, match) -> str:
+    """Group 1 of a match on the lowered text, in the original casing"""
+    return text[match.start(1):match.end(1)]
@@ -3,12 +3,15 @@ Insurance LLM API Test Suite
 Tests all API endpoints with realistic insurance document samples
 """
 
+import os
 import requests
 import json
 from dataclasses import dataclass
 from typing import Optional
 
 BASE_URL = "http://localhost:8081"
+# Must match the server's ADMIN_TOKEN for the authorized admin checks
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
 
 # Test Documents
 MESSY_COI_EMAIL = """fwd: insurance stuff
@@ -450,6 +453,7 @@ class InsuranceLLMTester:
 
         # COI Compliance Tests
         self.test_coi_compliance()
+        self.test_coi_compliance_batch()
 
         # Lease Analysis Tests
         self.test_lease_analysis()
@@ -474,6 +478,11 @@ class InsuranceLLMTester:
 
         # Proposal Generation Tests
         self.test_generate_proposal()
+        self.test_generate_proposal_stream()
+
+        # Admin Tests
+        self.test_admin_reprocess()
+        self.test_admin_apply_reprocess()
 
         # Edge Cases
         self.test_invalid_json_payload()
@@ -484,14 +493,14 @@ class InsuranceLLMTester:
 
         return self.results
 
-    def _make_request(self, method: str, endpoint: str, data: dict = None) -> tuple[int, dict]:
+    def _make_request(self, method: str, endpoint: str, data: dict = None, headers: dict = None) -> tuple[int, dict]:
         """Make HTTP request and return status code and response"""
         url = f"{self.base_url}{endpoint}"
         try:
             if method == "GET":
-                resp = requests.get(url, timeout=60)
+                resp = requests.get(url, headers=headers, timeout=60)
             elif method == "POST":
-                resp = requests.post(url, json=data, timeout=60)
+                resp = requests.post(url, json=data, headers=headers, timeout=60)
             return resp.status_code, resp.json() if resp.text else {}
         except requests.exceptions.ConnectionError:
             return 0, {"error": "Connection refused - is the server running?"}
@@ -642,6 +651,41 @@ class InsuranceLLMTester:
             data
         )
 
+    def test_coi_compliance_batch(self):
+        """Test batch COI compliance checking"""
+        status, data = self._make_request("POST", "/api/check-coi-compliance/batch", {
+            "coi_texts": [MESSY_COI_EMAIL, MESSY_COI_EMAIL],
+            "project_type": "commercial_construction",
+            "state": "NY"
+        })
+
+        if status == 0:
+            self._add_result("COI Compliance Batch", False, data.get("error", "Connection failed"))
+            return
+
+        checks = []
+        checks.append(("status_ok", status == 200))
+        checks.append(("one_result_per_coi", isinstance(data, list) and len(data) == 2))
+        results = data if isinstance(data, list) else []
+        checks.append(("has_reports", all(r.get("report") and "overall_status" in r["report"] for r in results)))
+        checks.append(("no_errors", all(r.get("error") is None for r in results)))
+
+        # Oversized batches are rejected before any COI is checked
+        status, _ = self._make_request("POST", "/api/check-coi-compliance/batch", {
+            "coi_texts": ["x"] * 51
+        })
+        checks.append(("rejects_oversized_batch", status == 422))
+
+        failed = [c[0] for c in checks if not c[1]]
+        passed = len(failed) == 0
+
+        self._add_result(
+            "COI Compliance Batch",
+            passed,
+            f"Failed checks: {failed}" if not passed else "Batch COI compliance check working",
+            data
+        )
+
     # ==================== LEASE ANALYSIS TESTS ====================
 
     def test_lease_analysis(self):
@@ -1375,6 +1419,97 @@ class InsuranceLLMTester:
             {"proposal_length": len(proposal), "preview": proposal[:200] + "..."} if proposal else data
         )
 
+    def test_generate_proposal_stream(self):
+        """Test streamed proposal generation returns the full markdown"""
+        _, extracted = self._make_request("POST", "/api/extract", {"text": MESSY_COI_EMAIL})
+
+        if not extracted or "coverages" not in extracted:
+            self._add_result("Generate Proposal Stream", False, "Could not extract document first")
+            return
+
+        try:
+            resp = requests.post(f"{self.base_url}/api/generate-proposal/stream", json=extracted, stream=True, timeout=60)
+            proposal = "".join(resp.iter_content(chunk_size=None, decode_unicode=True))
+        except requests.exceptions.RequestException as e:
+            self._add_result("Generate Proposal Stream", False, str(e))
+            return
+
+        checks = []
+        checks.append(("status_ok", resp.status_code == 200))
+        checks.append(("is_markdown", resp.headers.get("content-type", "").startswith("text/markdown")))
+        checks.append(("proposal_not_empty", len(proposal) > 100))
+        checks.append(("mentions_insured", "pickle" in proposal.lower() or "artisanal" in proposal.lower()))
+
+        failed = [c[0] for c in checks if not c[1]]
+        passed = len(failed) == 0
+
+        self._add_result(
+            "Generate Proposal Stream",
+            passed,
+            f"Failed checks: {failed}" if not passed else "Proposal streamed successfully",
+            {"proposal_length": len(proposal), "preview": proposal[:200] + "..."}
+        )
+
+    # ==================== ADMIN TESTS ====================
+
+    def test_admin_reprocess(self):
+        """Test batch reprocessing requires the admin token and rejects empty batches"""
+        status, data = self._make_request("POST", "/api/admin/reprocess", {"upload_ids": [1]})
+
+        if status == 0:
+            self._add_result("Admin Reprocess", False, data.get("error", "Connection failed"))
+            return
+
+        checks = []
+        checks.append(("rejects_missing_token", status == 403))
+
+        status, _ = self._make_request("POST", "/api/admin/reprocess", {"upload_ids": [1]},
+                                       headers={"X-Admin-Token": "wrong-token"})
+        checks.append(("rejects_wrong_token", status == 403))
+
+        if ADMIN_TOKEN:
+            # No upload ids means nothing to reprocess (in mock mode batches are unavailable)
+            status, data = self._make_request("POST", "/api/admin/reprocess", {"upload_ids": []},
+                                              headers={"X-Admin-Token": ADMIN_TOKEN})
+            checks.append(("rejects_empty_batch", status == 400))
+
+        failed = [c[0] for c in checks if not c[1]]
+        passed = len(failed) == 0
+
+        self._add_result(
+            "Admin Reprocess",
+            passed,
+            f"Failed checks: {failed}" if not passed else "Admin reprocess guarded correctly",
+            data
+        )
+
+    def test_admin_apply_reprocess(self):
+        """Test applying a batch requires the admin token and reports unknown batches"""
+        status, data = self._make_request("POST", "/api/admin/reprocess/batch_missing/apply")
+
+        if status == 0:
+            self._add_result("Admin Apply Reprocess", False, data.get("error", "Connection failed"))
+            return
+
+        checks = []
+        checks.append(("rejects_missing_token", status == 403))
+
+        if ADMIN_TOKEN:
+            status, data = self._make_request("POST", "/api/admin/reprocess/batch_missing/apply",
+                                              headers={"X-Admin-Token": ADMIN_TOKEN})
+            checks.append(("unknown_batch_fails", status == 500))
+            checks.append(("has_detail", "Applying batch failed" in data.get("detail", "")))
+
+        failed = [c[0] for c in checks if not c[1]]
+        passed = len(failed) == 0
+
+        self._add_result(
+            "Admin Apply Reprocess",
+            passed,
+            f"Failed checks: {failed}" if not passed else "Admin apply guarded correctly",
+            data
+        )
+
     # ==================== ERROR HANDLING TESTS ====================
 
     def test_invalid_json_payload(self):
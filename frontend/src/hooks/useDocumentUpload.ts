@@ -59,19 +59,6 @@ export function useDocumentUpload({ onReportsReset }: UseDocumentUploadOptions)
     }
   }
 
-  const fileToBase64 = (file: File): Promise<string> => {
-    return new Promise((resolve, reject) => {
-      const reader = new FileReader()
-      reader.readAsDataURL(file)
-      reader.onload = () => {
-        const result = reader.result as string
-        const base64 = result.split(',')[1]
-        resolve(base64)
-      }
-      reader.onerror = reject
-    })
-  }
-
   const onDrop = useCallback(async (acceptedFiles: File[]) => {
     const file = acceptedFiles[0]
     if (!file) return
@@ -99,15 +86,11 @@ export function useDocumentUpload({ onReportsReset }: UseDocumentUploadOptions)
     // For PDFs and images, send to OCR endpoint
     setOcrLoading(true)
     try {
-      const base64 = await fileToBase64(file)
+      const formData = new FormData()
+      formData.append('file', file)
       const res = await fetch(`${API_BASE}/api/ocr`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          file_data: base64,
-          file_type: file.type,
-          file_name: file.name
-        })
+        body: formData
       })
 
       if (!res.ok) throw new Error('OCR failed')